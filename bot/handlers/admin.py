@@ -23,8 +23,7 @@ logger = logging.getLogger(__name__)
 router = Router()
 router.message.middleware(admin_required())
 
-# Получаем сервисы
-certificate_service = get_certificate_service()
+# Получаем настройки
 settings = get_settings()
 
 
@@ -74,6 +73,8 @@ support@company.com
 @router.message(CreateCertificateStates.waiting_for_certificate_data)
 async def process_certificate_data(message: Message, state: FSMContext):
     """Обрабатывает данные сертификата, переданные одним сообщением."""
+    certificate_service = get_certificate_service()
+
     if message.text == ButtonTexts.CANCEL:
         await cancel_creation(message, state)
         return
@@ -354,6 +355,8 @@ def parse_certificate_with_labels(text: str) -> dict:
 @router.message(CreateCertificateStates.waiting_for_confirmation)
 async def process_confirmation(message: Message, state: FSMContext):
     """Обрабатывает подтверждение создания сертификата."""
+    certificate_service = get_certificate_service()
+
     if message.text == ButtonTexts.CANCEL:
         await cancel_creation(message, state)
         return
@@ -474,6 +477,8 @@ async def process_confirmation(message: Message, state: FSMContext):
 @router.message(F.text == ButtonTexts.MY_CERTIFICATES)
 async def show_user_certificates(message: Message):
     """Показывает сертификаты, созданные пользователем."""
+    certificate_service = get_certificate_service()
+
     try:
         certificates = certificate_service.get_user_certificates(
             message.from_user.id, active_only=False
@@ -14,8 +14,7 @@ from config.settings import get_settings
 logger = logging.getLogger(__name__)
 router = Router()
 
-# Получаем сервисы
-certificate_service = get_certificate_service()
+# Получаем настройки
 settings = get_settings()
 
 
@@ -201,6 +200,8 @@ async def cancel_command(message: Message, state: FSMContext, user_permissions:
 @router.message(Command("status"))
 async def status_command(message: Message, user_permissions: dict):
     """Обработчик команды /status для получения статистики (доступна всем авторизованным)."""
+    certificate_service = get_certificate_service()
+
     try:
         stats = certificate_service.get_statistics()
 
@@ -22,9 +22,6 @@ logger = logging.getLogger(__name__)
 router = Router()
 router.message.middleware(admin_required())
 
-# Получаем сервисы
-certificate_service = get_certificate_service()
-
 
 @router.message(F.text == ButtonTexts.EDIT_CERTIFICATE)
 async def start_edit_certificate(message: Message, state: FSMContext):
@@ -51,6 +48,8 @@ async def start_edit_certificate(message: Message, state: FSMContext):
 @router.message(EditCertificateStates.waiting_for_certificate_id)
 async def process_certificate_id_for_edit(message: Message, state: FSMContext):
     """Обрабатывает ввод ID сертификата для редактирования."""
+    certificate_service = get_certificate_service()
+
     if message.text == ButtonTexts.CANCEL:
         await cancel_edit(message, state)
         return
@@ -189,6 +188,8 @@ async def process_new_dates(message: Message, state: FSMContext):
 @router.message(EditCertificateStates.waiting_for_edit_confirmation)
 async def process_edit_confirmation(message: Message, state: FSMContext):
     """Обрабатывает подтверждение редактирования сертификата."""
+    certificate_service = get_certificate_service()
+
     if message.text == ButtonTexts.CANCEL_EDIT:
         await cancel_edit(message, state)
         return
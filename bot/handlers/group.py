@@ -18,8 +18,7 @@ from config.settings import get_settings
 logger = logging.getLogger(__name__)
 router = Router()
 
-# Получаем сервисы
-certificate_service = get_certificate_service()
+# Получаем настройки
 settings = get_settings()
 
 
@@ -38,6 +37,8 @@ async def cmd_verify(message: Message, command: CommandObject, user_permissions:
     Проверка сертификата по ID.
     Использование: /verify XXXXX-XXXXX-XXXXX-XXXXX
     """
+    certificate_service = get_certificate_service()
+
     if not command.args:
         help_text = (
             "🔍 Проверка сертификата\n\n"
@@ -87,6 +88,8 @@ async def cmd_search(message: Message, command: CommandObject, user_permissions:
     Поиск сертификатов по домену или ИНН.
     Использование: /search <домен или ИНН>
     """
+    certificate_service = get_certificate_service()
+
     if not command.args:
         help_text = (
             "🔎 Поиск сертификатов\n\n"
@@ -136,6 +139,8 @@ async def cmd_search(message: Message, command: CommandObject, user_permissions:
 @router.message(Command("list"))
 async def cmd_list(message: Message, user_permissions: dict):
     """Список всех активных сертификатов."""
+    certificate_service = get_certificate_service()
+
     try:
         search_request = SearchRequest(active_only=True)
         certificates = certificate_service.search_certificates(search_request)
@@ -158,6 +163,8 @@ async def cmd_list(message: Message, user_permissions: dict):
 @router.message(Command("stats"))
 async def cmd_stats(message: Message, user_permissions: dict):
     """Статистика по сертификатам (доступна всем авторизованным пользователям)."""
+    certificate_service = get_certificate_service()
+
     try:
         stats = certificate_service.get_statistics()
 
@@ -21,8 +21,7 @@ logger = logging.getLogger(__name__)
 router = Router()
 router.message.middleware(verify_required())
 
-# Получаем сервисы
-certificate_service = get_certificate_service()
+# Получаем настройки
 settings = get_settings()
 
 
@@ -45,6 +44,8 @@ async def start_verify_certificate(message: Message, state: FSMContext, user_per
 @router.message(VerifyCertificateStates.waiting_for_certificate_id)
 async def process_certificate_verification(message: Message, state: FSMContext, user_permissions: dict):
     """Обрабатывает проверку сертификата по ID."""
+    certificate_service = get_certificate_service()
+
     if message.text == ButtonTexts.CANCEL:
         await cancel_verification(message, state, user_permissions)
         return
@@ -159,6 +160,8 @@ async def process_search_type(message: Message, state: FSMContext):
 @router.message(SearchStates.waiting_for_domain_search)
 async def process_domain_search(message: Message, state: FSMContext, user_permissions: dict):
     """Обрабатывает поиск по домену."""
+    certificate_service = get_certificate_service()
+
     if message.text == ButtonTexts.BACK:
         await message.answer(
             "🔎 Поиск сертификатов\n\n"
@@ -210,6 +213,8 @@ async def process_domain_search(message: Message, state: FSMContext, user_permis
 @router.message(SearchStates.waiting_for_inn_search)
 async def process_inn_search(message: Message, state: FSMContext, user_permissions: dict):
     """Обрабатывает поиск по ИНН."""
+    certificate_service = get_certificate_service()
+
     if message.text == ButtonTexts.BACK:
         await message.answer(
             "🔎 Поиск сертификатов\n\n"
@@ -18,9 +18,13 @@ from aiogram.enums import ParseMode
 
 from config.settings import get_settings, validate_settings
 from core.database import get_db_manager
+from core.service import close_certificate_service
 from .middleware import setup_middlewares
 from .handlers import common, admin, verify, edit, group
 
+# Максимальное время ожидания фоновых записей при остановке, секунды
+SHUTDOWN_FLUSH_TIMEOUT = 10
+
 # Функция для безопасной настройки логирования
 def setup_logging():
     """Настройка логирования с проверкой прав доступа."""
@@ -207,6 +211,10 @@ async def on_shutdown(bot: Bot = None):
         except Exception as e:
             logger.warning(f"Не удалось отправить уведомление об остановке: {e}")
 
+    # Дописываем историю проверок и файлы сертификатов вне цикла событий; сервис,
+    # который ни разу не понадобился, не создается ради остановки
+    await asyncio.to_thread(close_certificate_service, SHUTDOWN_FLUSH_TIMEOUT)
+
     logger.info("Бот завершил работу")
 
 
@@ -2,24 +2,41 @@
 Основной модуль бизнес-логики системы сертификатов.
 """
 
-from .service import get_certificate_service
-from .models import Certificate, CertificateRequest, SearchRequest
-from .generator import CertificateIDGenerator
-from .validators import DataValidator
-from .database import get_db_manager, get_certificate_repo
-from .storage import get_file_storage, get_storage_manager
+from importlib import import_module
 
 __version__ = "1.0.0"
 
-__all__ = [
-    'get_certificate_service',
-    'Certificate',
-    'CertificateRequest',
-    'SearchRequest',
-    'CertificateIDGenerator',
-    'DataValidator',
-    'get_db_manager',
-    'get_certificate_repo',
-    'get_file_storage',
-    'get_storage_manager'
-]
\ No newline at end of file
+# Публичные имена пакета и модули, в которых они определены. Модуль
+# импортируется при первом обращении к имени, поэтому импорт отдельного
+# подмодуля (например, core.models) не загружает хранилище и БД
+_EXPORTS = {
+    'get_certificate_service': '.service',
+    'flush_certificate_service': '.service',
+    'close_certificate_service': '.service',
+    'Certificate': '.models',
+    'CertificateRequest': '.models',
+    'SearchRequest': '.models',
+    'CertificateIDGenerator': '.generator',
+    'DataValidator': '.validators',
+    'get_db_manager': '.database',
+    'get_certificate_repo': '.database',
+    'get_file_storage': '.storage',
+    'get_storage_manager': '.storage',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module_name, __name__), name)
+    # Последующие обращения идут напрямую, минуя __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -9,7 +9,7 @@ from datetime import datetime, date
 from typing import Optional, List
 from sqlalchemy import (
     create_engine, Column, String, Integer, DateTime, Date,
-    Boolean, Text, Index, UniqueConstraint, text
+    Boolean, Text, Index, UniqueConstraint, text, select, update, insert, tuple_
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
@@ -20,6 +20,9 @@ from config.settings import get_settings
 # Базовый класс для моделей
 Base = declarative_base()
 
+# Максимальное количество строк истории в одном INSERT
+HISTORY_INSERT_CHUNK = 500
+
 
 class Certificate(Base):
     """Модель сертификата."""
@@ -52,6 +55,11 @@ class Certificate(Base):
         Index('idx_certificate_active_inn', 'inn', 'is_active'),
         Index('idx_certificate_validity', 'valid_from', 'valid_to'),
         Index('idx_certificate_created_by', 'created_by'),
+        # Частичные индексы под выборки активных сертификатов по домену и создателю
+        Index('idx_certificate_domain_active_only', 'domain', 'created_at',
+              postgresql_where=text('is_active')),
+        Index('idx_certificate_created_by_active_only', 'created_by', 'created_at',
+              postgresql_where=text('is_active')),
     )
 
     def __repr__(self):
@@ -152,6 +160,12 @@ class DatabaseManager:
     def create_tables(self):
         """Создает все таблицы в базе данных."""
         Base.metadata.create_all(bind=self.engine)
+
+        # create_all не добавляет новые индексы в уже существующие таблицы
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+
         print("Таблицы базы данных созданы успешно")
 
     def drop_tables(self):
@@ -246,6 +260,65 @@ class CertificateRepository:
 
         return new_certificate
 
+    def bulk_insert(self, certificates_data: List[dict]) -> List[Certificate]:
+        """
+        Создает несколько сертификатов одним пакетным INSERT.
+
+        Args:
+            certificates_data: Список данных сертификатов
+
+        Returns:
+            List[Certificate]: Созданные сертификаты в порядке входных данных
+        """
+        if not certificates_data:
+            return []
+
+        with self.db_manager.get_session() as session:
+            certificates = session.scalars(
+                insert(Certificate).returning(Certificate, sort_by_parameter_order=True),
+                certificates_data
+            ).all()
+
+            # Записи истории вставляются сразу, а не через session.add:
+            # они не зависят от состояния объектов в сессии
+            history_rows = [
+                {
+                    "certificate_id": certificate.certificate_id,
+                    "action": "created",
+                    "performed_by": str(certificate.created_by),
+                    "details": {"domain": certificate.domain, "inn": certificate.inn}
+                }
+                for certificate in certificates
+            ]
+            for start in range(0, len(history_rows), HISTORY_INSERT_CHUNK):
+                session.execute(insert(CertificateHistory), history_rows[start:start + HISTORY_INSERT_CHUNK])
+
+            # Отсоединяем сертификаты, чтобы commit не сбросил загруженные атрибуты
+            for certificate in certificates:
+                session.expunge(certificate)
+            session.commit()
+
+        return certificates
+
+    def get_domains_with_certificates(self, domains: List[str], active_only: bool = True) -> set[str]:
+        """
+        Возвращает домены из списка, для которых уже есть сертификаты.
+
+        Args:
+            domains: Доменные имена
+            active_only: Только активные сертификаты
+
+        Returns:
+            set[str]: Домены с существующими сертификатами
+        """
+        with self.db_manager.get_session() as session:
+            query = session.query(Certificate.domain).filter(Certificate.domain.in_(domains))
+
+            if active_only:
+                query = query.filter(Certificate.is_active == True)
+
+            return {row.domain for row in query.distinct()}
+
     def get_certificate_by_id(self, certificate_id: str) -> Optional[Certificate]:
         """
         Получает сертификат по ID.
@@ -319,14 +392,20 @@ class CertificateRepository:
             return query.order_by(Certificate.created_at.desc()).all()
 
     def search_certificates(self, domain: str = None, inn: str = None,
-                            active_only: bool = True) -> List[Certificate]:
+                            active_only: bool = True, limit: int = None,
+                            after_id: str = None) -> List[Certificate]:
         """
         Поиск сертификатов по домену и/или ИНН.
 
+        Результаты упорядочены от новых к старым. Для постраничной выдачи
+        передается ID последнего сертификата предыдущей страницы (keyset).
+
         Args:
             domain: Доменное имя для поиска
             inn: ИНН для поиска
             active_only: Только активные сертификаты
+            limit: Максимальное количество результатов
+            after_id: ID сертификата, после которого начинается выдача
 
         Returns:
             List[Certificate]: Список найденных сертификатов
@@ -343,7 +422,22 @@ class CertificateRepository:
             if active_only:
                 query = query.filter(Certificate.is_active == True)
 
-            return query.order_by(Certificate.created_at.desc()).all()
+            if after_id:
+                cursor_created_at = session.query(Certificate.created_at).filter(
+                    Certificate.certificate_id == after_id
+                ).scalar()
+                if cursor_created_at is None:
+                    return []
+                query = query.filter(
+                    tuple_(Certificate.created_at, Certificate.certificate_id) < (cursor_created_at, after_id)
+                )
+
+            query = query.order_by(Certificate.created_at.desc(), Certificate.certificate_id.desc())
+
+            if limit:
+                query = query.limit(limit)
+
+            return query.all()
 
     def get_existing_certificate_ids(self) -> set[str]:
         """
@@ -407,6 +501,71 @@ class CertificateRepository:
 
             return False
 
+    def update_certificate_dates_returning(self, certificate_id: str, new_valid_from: date,
+                                           new_valid_to: date, user_id: str,
+                                           reason: str = None) -> Optional[Certificate]:
+        """
+        Обновляет даты действия сертификата одним UPDATE ... RETURNING.
+
+        Старые даты для истории берутся из подзапроса в том же выражении,
+        поэтому отдельные SELECT до и после обновления не нужны.
+
+        Args:
+            certificate_id: ID сертификата
+            new_valid_from: Новая дата начала действия
+            new_valid_to: Новая дата окончания действия
+            user_id: ID пользователя, выполняющего изменение
+            reason: Причина изменения
+
+        Returns:
+            Optional[Certificate]: Обновленный сертификат или None если не найден
+        """
+        old = select(
+            Certificate.certificate_id,
+            Certificate.valid_from.label("old_valid_from"),
+            Certificate.valid_to.label("old_valid_to")
+        ).where(
+            Certificate.certificate_id == certificate_id
+        ).with_for_update().subquery()
+
+        stmt = (
+            update(Certificate)
+            .where(Certificate.certificate_id == old.c.certificate_id)
+            .values(valid_from=new_valid_from, valid_to=new_valid_to)
+            .returning(Certificate, old.c.old_valid_from, old.c.old_valid_to)
+            .execution_options(synchronize_session=False)
+        )
+
+        with self.db_manager.get_session() as session:
+            row = session.execute(stmt).first()
+            if row is None:
+                return None
+
+            certificate, old_valid_from, old_valid_to = row
+
+            # Добавляем запись в историю
+            details = {
+                "old_valid_from": old_valid_from.isoformat(),
+                "old_valid_to": old_valid_to.isoformat(),
+                "new_valid_from": new_valid_from.isoformat(),
+                "new_valid_to": new_valid_to.isoformat(),
+                "reason": reason
+            }
+
+            self._add_history_record(
+                session,
+                certificate_id,
+                "dates_updated",
+                user_id,
+                details
+            )
+
+            # Отсоединяем объект, чтобы commit не сбросил загруженные атрибуты
+            session.expunge(certificate)
+            session.commit()
+
+        return certificate
+
     def deactivate_certificate(self, certificate_id: str, user_id: str) -> bool:
         """
         Деактивирует сертификат.
@@ -452,6 +611,33 @@ class CertificateRepository:
             self._add_history_record(session, certificate_id, "verified", user_id, details)
             session.commit()
 
+    def add_verification_records_batch(self, records: List[tuple]):
+        """
+        Добавляет пакет записей о проверке сертификатов.
+
+        Записи вставляются многострочными INSERT не более чем по
+        HISTORY_INSERT_CHUNK строк за выражение.
+
+        Args:
+            records: Список кортежей (certificate_id, user_id, details)
+        """
+        rows = []
+        for certificate_id, user_id, details in records:
+            row = {
+                "certificate_id": certificate_id,
+                "action": "verified",
+                "performed_by": str(user_id)
+            }
+            # None в JSONB сохранился бы как JSON null, а не SQL NULL
+            if details is not None:
+                row["details"] = details
+            rows.append(row)
+
+        with self.db_manager.get_session() as session:
+            for start in range(0, len(rows), HISTORY_INSERT_CHUNK):
+                session.execute(insert(CertificateHistory), rows[start:start + HISTORY_INSERT_CHUNK])
+            session.commit()
+
     def _add_history_record(self, session: Session, certificate_id: str,
                             action: str, user_id: str, details: dict = None):
         """
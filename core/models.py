@@ -6,8 +6,9 @@ Pydantic модели для валидации и сериализации да
 
 from datetime import datetime, date
 from typing import Optional, List
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 from .exceptions import *
+from .validators import MAX_PERIOD, domain_error, inn_error, validate_period
 
 
 class CertificateRequest(BaseModel):
@@ -26,36 +27,12 @@ class CertificateRequest(BaseModel):
     @validator('domain')
     def validate_domain(cls, v):
         """Валидация доменного имени."""
-        # Перенесем логику валидации сюда, избегая circular import
         domain = v.lower().strip()
 
-        # Базовая валидация длины
-        if not domain or len(domain) > 255:
-            raise DomainValidationError(f"Некорректная длина домена: {domain}")
-
-        # Проверка паттерна
-        import re
-        domain_pattern = re.compile(r'^(\*\.)?[a-zA-Z0-9]([a-zA-Z0-9.-]*[a-zA-Z0-9])?$')
-        if not domain_pattern.match(domain):
-            raise DomainValidationError(f"Некорректный формат домена: {domain}")
-
-        # Обрабатываем wildcard
-        test_domain = domain[2:] if domain.startswith('*.') else domain
-
-        # Разделяем на части
-        parts = test_domain.split('.')
-        if len(parts) < 2:
-            raise DomainValidationError(f"Домен должен содержать минимум 2 части: {domain}")
-
-        # Валидируем каждую часть
-        domain_part_pattern = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$')
-        for part in parts:
-            if not part or len(part) > 63:
-                raise DomainValidationError(f"Некорректная часть домена: {part}")
-            if part.startswith('-') or part.endswith('-'):
-                raise DomainValidationError(f"Часть домена не может начинаться или заканчиваться дефисом: {part}")
-            if not domain_part_pattern.match(part):
-                raise DomainValidationError(f"Некорректные символы в части домена: {part}")
+        # Проверка общим валидатором из core.validators
+        error = domain_error(domain)
+        if error:
+            raise DomainValidationError(error)
 
         return domain
 
@@ -63,68 +40,20 @@ class CertificateRequest(BaseModel):
     def validate_inn(cls, v):
         """Валидация ИНН (РФ) и БИН (Казахстан)."""
         inn = v.strip()
-    
-        if not inn or not inn.isdigit():
-            raise INNValidationError(f"ИНН/БИН должен содержать только цифры: {inn}")
-    
-        if len(inn) == 10:
-            # Валидация 10-значного ИНН РФ
-            coefficients = [2, 4, 10, 3, 5, 9, 4, 6, 8]
-            checksum = sum(int(inn[i]) * coefficients[i] for i in range(9))
-            control_digit = (checksum % 11) % 10
-            if int(inn[9]) != control_digit:
-                raise INNValidationError(f"Некорректная контрольная сумма ИНН: {inn}")
-        elif len(inn) == 12:
-            # Сначала пробуем как ИНН РФ
-            try:
-                # Первая контрольная цифра
-                coefficients_1 = [7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
-                checksum_1 = sum(int(inn[i]) * coefficients_1[i] for i in range(10))
-                control_digit_1 = (checksum_1 % 11) % 10
-                
-                # Вторая контрольная цифра
-                coefficients_2 = [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
-                checksum_2 = sum(int(inn[i]) * coefficients_2[i] for i in range(11))
-                control_digit_2 = (checksum_2 % 11) % 10
-                
-                # Если обе контрольные суммы совпадают - это ИНН РФ
-                if int(inn[10]) == control_digit_1 and int(inn[11]) == control_digit_2:
-                    return inn
-            except:
-                pass
-            
-            # Если не прошел как ИНН РФ, проверяем как БИН Казахстана
-            # Формат БИН: ГГММXXXXXX## (12 цифр, где ММ - месяц от 01 до 12)
-            try:
-                month = int(inn[2:4])
-                if month < 1 or month > 12:
-                    raise INNValidationError(f"Некорректный формат ИНН/БИН: {inn}")
-                # БИН принят
-                return inn
-            except ValueError:
-                raise INNValidationError(f"Некорректный формат ИНН/БИН: {inn}")
-        else:
-            raise INNValidationError(f"ИНН/БИН должен содержать 10 или 12 цифр: {inn}")
-    
+
+        error = inn_error(inn)
+        if error:
+            raise INNValidationError(error)
+
         return inn
 
     @validator('valid_to')
     def validate_period(cls, v, values):
         """Валидация периода действия."""
         if 'valid_from' in values:
-            valid_from = values['valid_from']
-            if v <= valid_from:
-                raise PeriodValidationError("Дата окончания должна быть позже даты начала")
-
-            # Проверяем, что период не превышает 5 лет
-            years_diff = (v - valid_from).days / 365.25
-            if years_diff > 5:
-                raise PeriodValidationError("Период действия не может превышать 5 лет")
-
-            # Проверяем, что даты не в прошлом
-            today = date.today()
-            if valid_from < today:
-                raise PeriodValidationError("Дата начала не может быть в прошлом")
+            is_valid, error = validate_period(values['valid_from'], v)
+            if not is_valid:
+                raise PeriodValidationError(error)
 
         return v
 
@@ -164,11 +93,24 @@ class Certificate(BaseModel):
         """Возвращает период действия в формате DD.MM.YYYY-DD.MM.YYYY."""
         return f"{self.valid_from.strftime('%d.%m.%Y')}-{self.valid_to.strftime('%d.%m.%Y')}"
 
+    # Рассчитанный статус и дата, на которую он рассчитан
+    _status_cache: Optional[tuple] = PrivateAttr(default=None)
+
     @property
     def status_info(self) -> dict:
         """Возвращает детальную информацию о статусе сертификата."""
         today = date.today()
 
+        # Статус зависит только от полей модели и текущей даты
+        cached = self._status_cache
+        if cached is None or cached[0] != today:
+            cached = (today, self._compute_status_info(today))
+            self._status_cache = cached
+
+        return cached[1]
+
+    def _compute_status_info(self, today: date) -> dict:
+        """Рассчитывает информацию о статусе сертификата на указанную дату."""
         # Если сертификат деактивирован
         if not self.is_active:
             return {
@@ -285,6 +227,8 @@ class Certificate(BaseModel):
             "users_count": self.users_count,
             "created_at": self.created_at.isoformat(),
             "created_by": str(self.created_by),
+            "created_by_username": self.created_by_username,
+            "created_by_full_name": self.created_by_full_name,
             "is_active": self.is_active,
             "status": status["status"],
             "status_text": status["text"],
@@ -298,6 +242,8 @@ class Certificate(BaseModel):
     class Config:
         """Конфигурация модели."""
         from_attributes = True
+        # Экземпляры разделяются между запросами (кэш проверок), поэтому неизменяемы
+        frozen = True
         json_schema_extra = {
             "example": {
                 "certificate_id": "A7K9M-X3P2R-Q8W1E-RT0524",
@@ -329,8 +275,7 @@ class EditCertificateDatesRequest(BaseModel):
                 raise ValueError("Дата окончания должна быть позже даты начала")
 
             # Проверяем, что период не превышает 5 лет
-            years_diff = (v - values['new_valid_from']).days / 365.25
-            if years_diff > 5:
+            if v - values['new_valid_from'] > MAX_PERIOD:
                 raise ValueError("Период действия не может превышать 5 лет")
 
         return v
@@ -368,6 +313,8 @@ class SearchRequest(BaseModel):
     inn: Optional[str] = Field(None, description="Поиск по ИНН")
     certificate_id: Optional[str] = Field(None, description="Поиск по ID сертификата")
     active_only: bool = Field(default=True, description="Только активные сертификаты")
+    limit: Optional[int] = Field(default=None, ge=1, description="Максимальное количество результатов (None - без ограничения)")
+    after_id: Optional[str] = Field(None, description="ID последнего сертификата предыдущей страницы")
 
     @validator('certificate_id')
     def validate_certificate_id_format(cls, v):
@@ -3,18 +3,71 @@
 """
 
 import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from datetime import datetime, date
+from functools import cached_property, partial
+from operator import attrgetter
 from typing import List, Optional, Dict, Tuple
+from cachetools import TTLCache
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from .models import Certificate, CertificateRequest, SearchRequest, EditCertificateDatesRequest
 from .database import get_certificate_repo, Certificate as DBCertificate
-from .storage import get_storage_manager
 from .generator import CertificateIDGenerator
-from .validators import DataValidator
 from .exceptions import *
 
 # Настройка логирования
 logger = logging.getLogger(__name__)
 
+# Параметры фоновой записи истории проверок
+AUDIT_BATCH_SIZE = 500
+AUDIT_FLUSH_INTERVAL = 0.2
+# Метка в очереди, после которой фоновый поток завершается
+_AUDIT_STOP = object()
+
+# Время актуальности снимка статистики, секунды
+STATS_TTL = 30
+
+# Поля, переносимые из строки БД в Pydantic модель без изменений
+_DB_FIELDS = (
+    'certificate_id', 'domain', 'inn', 'valid_from', 'valid_to', 'users_count',
+    'created_at', 'created_by_username', 'created_by_full_name',
+    'request_email', 'contacts'
+)
+# Все читаемые атрибуты строки: поля выше, затем требующие преобразования
+_extract_db_fields = attrgetter(*_DB_FIELDS, 'id', 'is_active', 'created_by')
+
+
+# Основной блок информации о сертификате
+_CERT_INFO_TMPL = (
+    "🆔 ID: {}\n"
+    "🌐 Домен: {}\n"
+    "🏢 ИНН: {}\n"
+    "📅 Период: {}\n"
+    "👥 Пользователей: {}\n"
+    "{} Статус: {}"
+)
+
+
+def _format_days_left(status: dict, certificate: Certificate) -> str:
+    return f"{status['days_left']}д"
+
+
+def _format_inactive(status: dict, certificate: Certificate) -> str:
+    return "неактивен"
+
+
+# Краткое описание статуса для списка сертификатов
+_STATUS_FORMATTERS = {
+    'not_started': lambda status, cert: f"начнется {cert.valid_from:%d.%m}",
+    'expired': lambda status, cert: f"истек {cert.valid_to:%d.%m}",
+    'expiring_very_soon': _format_days_left,
+    'expiring_soon': _format_days_left,
+    'active': _format_days_left,
+}
+
 
 class CertificateService:
     """Сервис для работы с сертификатами."""
@@ -22,9 +75,44 @@ class CertificateService:
     def __init__(self):
         """Инициализация сервиса."""
         self.certificate_repo = get_certificate_repo()
-        self.storage_manager = get_storage_manager()
         self.id_generator = CertificateIDGenerator()
-        self.validator = DataValidator()
+        # Кэш существующих ID сертификатов, загружается при первом создании
+        self._id_cache: Optional[set[str]] = None
+        # Запись файлов выполняется в фоне, чтобы не задерживать ответ пользователю
+        self._io_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="certificate-storage")
+        self._pending_saves = set()
+        # Последняя поставленная запись файла по каждому сертификату: следующая
+        # запись того же сертификата ждет ее, чтобы старый снимок не перезаписал новый
+        self._save_tails: Dict[str, Future] = {}
+        self._save_lock = threading.Lock()
+        # Кэш проверенных сертификатов, сбрасывается при изменении сертификата
+        self._cert_cache = TTLCache(maxsize=10_000, ttl=60)
+        self._cert_cache_lock = threading.Lock()
+        # Номер сброса кэша по каждому измененному сертификату: запись, прочитанная
+        # из БД до сброса, не попадает в кэш
+        self._cert_generations: Dict[str, int] = {}
+        # Записи о проверках пишутся в БД пакетами фоновым потоком,
+        # который запускается при первой записи
+        self._audit_queue = queue.Queue()
+        self._audit_thread: Optional[threading.Thread] = None
+        self._audit_lock = threading.Lock()
+        # Снимок статистики, обновляемый не чаще чем раз в STATS_TTL секунд
+        self._stats_cache: Optional[Dict] = None
+        self._stats_ts = 0.0
+        self._stats_refreshing = False
+        self._stats_lock = threading.Lock()
+
+    @cached_property
+    def storage_manager(self):
+        """Менеджер файлового хранилища, создается при первом обращении."""
+        from .storage import get_storage_manager
+        return get_storage_manager()
+
+    @cached_property
+    def validator(self):
+        """Валидатор данных сертификата, создается при первом обращении."""
+        from .validators import DataValidator
+        return DataValidator()
 
     def create_certificate(self, request: CertificateRequest) -> Tuple[Certificate, bool]:
         """
@@ -50,49 +138,158 @@ class CertificateService:
             )
             has_existing = len(existing_certificates) > 0
 
-            # Получаем все существующие ID для проверки уникальности
-            existing_ids = self.certificate_repo.get_existing_certificate_ids()
-
-            # Генерируем уникальный ID
-            certificate_id = self.id_generator.generate(request.valid_to, existing_ids)
+            # Существующие ID загружаются из БД один раз, далее кэш пополняется локально
+            if self._id_cache is None:
+                self._id_cache = self.certificate_repo.get_existing_certificate_ids()
 
             # Создаем объект сертификата для БД
-            db_certificate_data = {
-                "certificate_id": certificate_id,
-                "domain": request.domain,
-                "inn": request.inn,
-                "valid_from": request.valid_from,
-                "valid_to": request.valid_to,
-                "users_count": request.users_count,
-                "created_by": str(request.created_by),
-                "created_by_username": request.created_by_username,
-                "created_by_full_name": request.created_by_full_name,
-                "is_active": True,
-                "request_email": request.request_email,
-                "contacts": request.contacts
-            }
-
-            # Сохраняем в БД
-            db_certificate = self.certificate_repo.create_certificate(db_certificate_data)
+            db_certificate_data = self._db_certificate_data(request)
+
+            # Генерируем уникальный ID и сохраняем в БД
+            try:
+                db_certificate = self._insert_with_new_id(db_certificate_data, request.valid_to)
+            except IntegrityError:
+                # ID мог быть создан другим процессом - перечитываем кэш и повторяем
+                logger.warning("Конфликт ID сертификата, обновляем кэш существующих ID")
+                self._id_cache = self.certificate_repo.get_existing_certificate_ids()
+                db_certificate = self._insert_with_new_id(db_certificate_data, request.valid_to)
+
+            certificate_id = db_certificate.certificate_id
 
             # Создаем Pydantic модель для возврата из данных БД
             certificate = self._convert_db_to_pydantic(db_certificate)
 
-            # Сохраняем в файловое хранилище
-            try:
-                self.storage_manager.save_certificate_complete(certificate)
-                logger.info(f"Сертификат {certificate_id} сохранен в файловое хранилище")
-            except Exception as e:
-                logger.warning(f"Ошибка сохранения сертификата в файл: {e}")
+            # Сохраняем в файловое хранилище в фоне
+            self._submit_save(certificate)
 
             logger.info(f"Сертификат {certificate_id} успешно создан")
             return certificate, has_existing
 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"Ошибка создания сертификата: {e}")
-            if isinstance(e, (ValidationError, GenerationError, DatabaseError)):
-                raise
-            raise DatabaseError(f"Неожиданная ошибка при создании сертификата: {e}")
+            raise DatabaseError(f"Ошибка БД при создании сертификата: {e}") from e
+
+    def create_certificates_bulk(self, requests: List[CertificateRequest]) -> List[Tuple[Certificate, bool]]:
+        """
+        Создает несколько сертификатов одним пакетом.
+
+        Args:
+            requests: Запросы на создание сертификатов
+
+        Returns:
+            List[Tuple[Certificate, bool]]: Созданные сертификаты и флаги о наличии
+                существующих сертификатов для домена, в порядке запросов
+
+        Raises:
+            ValidationError: При ошибке валидации
+            GenerationError: При ошибке генерации ID
+            DatabaseError: При ошибке БД
+        """
+        logger.info(f"Пакетное создание сертификатов: {len(requests)}")
+
+        if not requests:
+            return []
+
+        try:
+            existing_domains = self.certificate_repo.get_domains_with_certificates(
+                list({request.domain for request in requests}), active_only=True
+            )
+
+            # Домен считается существующим и для повторных запросов внутри пакета
+            has_existing = []
+            for request in requests:
+                has_existing.append(request.domain in existing_domains)
+                existing_domains.add(request.domain)
+
+            if self._id_cache is None:
+                self._id_cache = self.certificate_repo.get_existing_certificate_ids()
+
+            try:
+                db_certificates = self._bulk_insert_with_new_ids(requests)
+            except IntegrityError:
+                logger.warning("Конфликт ID сертификата, обновляем кэш существующих ID")
+                self._id_cache = self.certificate_repo.get_existing_certificate_ids()
+                db_certificates = self._bulk_insert_with_new_ids(requests)
+
+            certificates = self._convert_many(db_certificates)
+
+            for certificate in certificates:
+                self._submit_save(certificate)
+
+            logger.info(f"Создано сертификатов: {len(certificates)}")
+            return list(zip(certificates, has_existing))
+
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка пакетного создания сертификатов: {e}")
+            raise DatabaseError(f"Ошибка БД при пакетном создании сертификатов: {e}") from e
+
+    def _db_certificate_data(self, request: CertificateRequest) -> dict:
+        """
+        Формирует данные для записи сертификата в БД (без ID сертификата).
+
+        Args:
+            request: Запрос на создание сертификата
+
+        Returns:
+            dict: Данные сертификата для БД
+        """
+        return {
+            "domain": request.domain,
+            "inn": request.inn,
+            "valid_from": request.valid_from,
+            "valid_to": request.valid_to,
+            "users_count": request.users_count,
+            "created_by": str(request.created_by),
+            "created_by_username": request.created_by_username,
+            "created_by_full_name": request.created_by_full_name,
+            "is_active": True,
+            "request_email": request.request_email,
+            "contacts": request.contacts
+        }
+
+    def _bulk_insert_with_new_ids(self, requests: List[CertificateRequest]) -> List[DBCertificate]:
+        """
+        Генерирует уникальные ID для пакета и сохраняет сертификаты в БД.
+
+        Args:
+            requests: Запросы на создание сертификатов
+
+        Returns:
+            List[DBCertificate]: Созданные сертификаты
+        """
+        certificates_data = []
+
+        try:
+            for request in requests:
+                certificate_id = self.id_generator.generate(request.valid_to, self._id_cache)
+                self._id_cache.add(certificate_id)
+                certificates_data.append({"certificate_id": certificate_id, **self._db_certificate_data(request)})
+
+            db_certificates = self.certificate_repo.bulk_insert(certificates_data)
+        except Exception:
+            # Пакет не сохранен - освобождаем зарезервированные ID
+            self._id_cache.difference_update(data["certificate_id"] for data in certificates_data)
+            raise
+
+        return db_certificates
+
+    def _insert_with_new_id(self, db_certificate_data: dict, valid_to: date) -> DBCertificate:
+        """
+        Генерирует уникальный ID и сохраняет сертификат в БД.
+
+        Args:
+            db_certificate_data: Данные сертификата без ID
+            valid_to: Дата окончания действия
+
+        Returns:
+            DBCertificate: Созданный сертификат
+        """
+        certificate_id = self.id_generator.generate(valid_to, self._id_cache)
+        db_certificate = self.certificate_repo.create_certificate(
+            {"certificate_id": certificate_id, **db_certificate_data}
+        )
+        self._id_cache.add(certificate_id)
+        return db_certificate
 
     def edit_certificate_dates(self, edit_request: EditCertificateDatesRequest) -> Certificate:
         """
@@ -111,13 +308,8 @@ class CertificateService:
         logger.info(f"Редактирование дат сертификата {edit_request.certificate_id} пользователем {edit_request.edited_by}")
 
         try:
-            # Находим сертификат в БД
-            db_certificate = self.certificate_repo.get_certificate_by_id(edit_request.certificate_id)
-            if not db_certificate:
-                raise CertificateNotFoundError(f"Сертификат {edit_request.certificate_id} не найден")
-
-            # Обновляем даты
-            success = self.certificate_repo.update_certificate_dates(
+            # Обновляем даты и получаем обновленную запись одним запросом
+            updated_db_certificate = self.certificate_repo.update_certificate_dates_returning(
                 edit_request.certificate_id,
                 edit_request.new_valid_from,
                 edit_request.new_valid_to,
@@ -125,28 +317,21 @@ class CertificateService:
                 edit_request.edit_reason
             )
 
-            if not success:
-                raise DatabaseError("Не удалось обновить даты сертификата")
+            if not updated_db_certificate:
+                raise CertificateNotFoundError(f"Сертификат {edit_request.certificate_id} не найден")
 
-            # Получаем обновленный сертификат
-            updated_db_certificate = self.certificate_repo.get_certificate_by_id(edit_request.certificate_id)
             updated_certificate = self._convert_db_to_pydantic(updated_db_certificate)
+            self._invalidate_cached(edit_request.certificate_id)
 
-            # Обновляем файл сертификата
-            try:
-                self.storage_manager.save_certificate_complete(updated_certificate)
-                logger.info(f"Файл сертификата {edit_request.certificate_id} обновлен")
-            except Exception as e:
-                logger.warning(f"Ошибка обновления файла сертификата: {e}")
+            # Обновляем файл сертификата в фоне
+            self._submit_save(updated_certificate)
 
             logger.info(f"Даты сертификата {edit_request.certificate_id} успешно обновлены")
             return updated_certificate
 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"Ошибка редактирования дат сертификата {edit_request.certificate_id}: {e}")
-            if isinstance(e, (CertificateNotFoundError, ValidationError, DatabaseError)):
-                raise
-            raise DatabaseError(f"Неожиданная ошибка при редактировании дат: {e}")
+            raise DatabaseError(f"Ошибка БД при редактировании дат: {e}") from e
 
     def verify_certificate(self, certificate_id: str, user_id: int) -> Optional[Certificate]:
         """
@@ -167,31 +352,34 @@ class CertificateService:
                 logger.warning(f"Некорректный формат ID сертификата: {certificate_id}")
                 raise ValidationError("Некорректный формат ID сертификата")
 
-            # Ищем сертификат в БД
-            db_certificate = self.certificate_repo.get_certificate_by_id(certificate_id)
+            # Ищем сертификат в кэше, затем в БД
+            with self._cert_cache_lock:
+                certificate = self._cert_cache.get(certificate_id)
+                generation = self._cert_generations.get(certificate_id, 0)
 
-            if not db_certificate:
-                logger.info(f"Сертификат {certificate_id} не найден")
-                return None
+            if certificate is None:
+                db_certificate = self.certificate_repo.get_certificate_by_id(certificate_id)
 
-            # Записываем факт проверки
-            self.certificate_repo.add_verification_record(
-                certificate_id,
-                str(user_id),
-                {"verified_at": datetime.now().isoformat()}
-            )
+                if not db_certificate:
+                    logger.info(f"Сертификат {certificate_id} не найден")
+                    return None
 
-            # Создаем Pydantic модель
-            certificate = self._convert_db_to_pydantic(db_certificate)
+                # Создаем Pydantic модель
+                certificate = self._convert_db_to_pydantic(db_certificate)
+                with self._cert_cache_lock:
+                    # Сертификат изменен во время чтения - прочитанная запись могла устареть
+                    if self._cert_generations.get(certificate_id, 0) == generation:
+                        self._cert_cache[certificate_id] = certificate
+
+            # Записываем факт проверки в фоне, время проставляет БД (performed_at)
+            self._enqueue_audit((certificate_id, str(user_id), None))
 
             logger.info(f"Сертификат {certificate_id} успешно проверен")
             return certificate
 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"Ошибка проверки сертификата {certificate_id}: {e}")
-            if isinstance(e, ValidationError):
-                raise
-            raise DatabaseError(f"Ошибка при проверке сертификата: {e}")
+            raise DatabaseError(f"Ошибка при проверке сертификата: {e}") from e
 
     def search_certificates(self, search_request: SearchRequest) -> List[Certificate]:
         """
@@ -209,18 +397,20 @@ class CertificateService:
             db_certificates = self.certificate_repo.search_certificates(
                 domain=search_request.domain,
                 inn=search_request.inn,
-                active_only=search_request.active_only
+                active_only=search_request.active_only,
+                limit=search_request.limit,
+                after_id=search_request.after_id
             )
 
             # Конвертируем в Pydantic модели
-            certificates = [self._convert_db_to_pydantic(db_cert) for db_cert in db_certificates]
+            certificates = self._convert_many(db_certificates)
 
             logger.info(f"Найдено сертификатов: {len(certificates)}")
             return certificates
 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"Ошибка поиска сертификатов: {e}")
-            raise DatabaseError(f"Ошибка при поиске сертификатов: {e}")
+            raise DatabaseError(f"Ошибка при поиске сертификатов: {e}") from e
 
     def get_user_certificates(self, user_id: int, active_only: bool = True) -> List[Certificate]:
         """
@@ -240,12 +430,11 @@ class CertificateService:
                 str(user_id), active_only
             )
 
-            certificates = [self._convert_db_to_pydantic(db_cert) for db_cert in db_certificates]
-            return certificates
+            return self._convert_many(db_certificates)
 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"Ошибка получения сертификатов пользователя {user_id}: {e}")
-            raise DatabaseError(f"Ошибка при получении сертификатов пользователя: {e}")
+            raise DatabaseError(f"Ошибка при получении сертификатов пользователя: {e}") from e
 
     def deactivate_certificate(self, certificate_id: str, user_id: int) -> bool:
         """
@@ -262,6 +451,7 @@ class CertificateService:
 
         try:
             result = self.certificate_repo.deactivate_certificate(certificate_id, str(user_id))
+            self._invalidate_cached(certificate_id)
 
             if result:
                 logger.info(f"Сертификат {certificate_id} успешно деактивирован")
@@ -270,32 +460,264 @@ class CertificateService:
 
             return result
 
-        except Exception as e:
+        except SQLAlchemyError as e:
             logger.error(f"Ошибка деактивации сертификата {certificate_id}: {e}")
-            raise DatabaseError(f"Ошибка при деактивации сертификата: {e}")
+            raise DatabaseError(f"Ошибка при деактивации сертификата: {e}") from e
 
     def get_statistics(self) -> Dict:
         """
         Получает статистику по сертификатам.
 
+        Статистика отдается из снимка. Устаревший снимок возвращается сразу,
+        а его обновление запускается в фоне.
+
         Returns:
             Dict: Статистика
         """
         logger.info("Получение статистики сертификатов")
 
+        with self._stats_lock:
+            snapshot = self._stats_cache
+            is_fresh = time.monotonic() - self._stats_ts < STATS_TTL
+
+            if snapshot is not None and not is_fresh and not self._stats_refreshing:
+                self._stats_refreshing = True
+                self._io_pool.submit(self._refresh_statistics_background)
+
+        if snapshot is None:
+            snapshot = self._refresh_statistics()
+
+        return snapshot
+
+    def _refresh_statistics(self) -> Dict:
+        """
+        Собирает статистику из БД и файлового хранилища и обновляет снимок.
+
+        Returns:
+            Dict: Статистика
+        """
         try:
             db_stats = self.certificate_repo.get_statistics()
             file_stats = self.storage_manager.file_storage.get_storage_stats()
 
-            return {
-                "database": db_stats,
-                "file_storage": file_stats,
-                "last_updated": datetime.now().isoformat()
-            }
+        except SQLAlchemyError as e:
+            logger.error(f"Ошибка получения статистики: {e}")
+            raise DatabaseError(f"Ошибка при получении статистики: {e}") from e
+
+        snapshot = {
+            "database": db_stats,
+            "file_storage": file_stats,
+            "last_updated": datetime.now().isoformat()
+        }
+
+        with self._stats_lock:
+            self._stats_cache = snapshot
+            self._stats_ts = time.monotonic()
 
+        return snapshot
+
+    def _refresh_statistics_background(self):
+        """Обновляет снимок статистики в фоновом потоке."""
+        try:
+            self._refresh_statistics()
         except Exception as e:
-            logger.error(f"Ошибка получения статистики: {e}")
-            raise DatabaseError(f"Ошибка при получении статистики: {e}")
+            logger.warning(f"Не удалось обновить статистику: {e}")
+        finally:
+            with self._stats_lock:
+                self._stats_refreshing = False
+
+    def _invalidate_cached(self, certificate_id: str):
+        """
+        Удаляет сертификат из кэша проверок.
+
+        Args:
+            certificate_id: ID сертификата
+        """
+        with self._cert_cache_lock:
+            self._cert_cache.pop(certificate_id, None)
+            self._cert_generations[certificate_id] = self._cert_generations.get(certificate_id, 0) + 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Дожидается завершения фоновых записей истории проверок и файлов.
+
+        Args:
+            timeout: Максимальное общее время ожидания в секундах
+
+        Returns:
+            bool: True если все записи завершены за отведенное время
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        audit_done = self._wait_audit_queue(deadline)
+        if not audit_done:
+            logger.warning(f"Не дождались записи истории проверок: {self._audit_queue.unfinished_tasks}")
+
+        with self._save_lock:
+            pending = list(self._pending_saves)
+        if pending:
+            logger.info(f"Ожидание завершения записи файлов: {len(pending)}")
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            _, not_done = wait(pending, timeout=remaining)
+            if not_done:
+                logger.warning(f"Не дождались записи файлов: {len(not_done)}")
+                return False
+
+        return audit_done
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        Дописывает фоновые записи и останавливает фоновые потоки сервиса.
+
+        Args:
+            timeout: Максимальное общее время ожидания в секундах
+
+        Returns:
+            bool: True если все записи завершены за отведенное время
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        with self._audit_lock:
+            audit_thread = self._audit_thread
+            if audit_thread is not None:
+                # Поток дописывает очередь до метки и завершается
+                self._audit_queue.put(_AUDIT_STOP)
+                self._audit_thread = None
+
+        done = self.flush(timeout)
+
+        if audit_thread is not None:
+            remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+            audit_thread.join(remaining)
+            done = done and not audit_thread.is_alive()
+
+        self._io_pool.shutdown(wait=False)
+        return done
+
+    def _wait_audit_queue(self, deadline: Optional[float]) -> bool:
+        """
+        Дожидается записи всех поставленных записей истории проверок.
+
+        Args:
+            deadline: Момент time.monotonic(), после которого ожидание прекращается
+
+        Returns:
+            bool: True если очередь записана до истечения срока
+        """
+        audit_queue = self._audit_queue
+        with audit_queue.all_tasks_done:
+            while audit_queue.unfinished_tasks:
+                if deadline is None:
+                    audit_queue.all_tasks_done.wait()
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                audit_queue.all_tasks_done.wait(remaining)
+        return True
+
+    def _enqueue_audit(self, record: tuple):
+        """
+        Ставит запись истории проверок в очередь, запуская фоновый поток при необходимости.
+
+        Args:
+            record: Кортеж (ID сертификата, ID пользователя, детали)
+        """
+        with self._audit_lock:
+            if self._audit_thread is None:
+                self._audit_thread = threading.Thread(
+                    target=self._audit_worker, name="certificate-audit", daemon=True
+                )
+                self._audit_thread.start()
+            self._audit_queue.put_nowait(record)
+
+    def _audit_worker(self):
+        """Фоновый поток, записывающий историю проверок пакетами до метки остановки."""
+        stopping = False
+        while not stopping:
+            item = self._audit_queue.get()
+            if item is _AUDIT_STOP:
+                self._audit_queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + AUDIT_FLUSH_INTERVAL
+
+            # Добираем записи, накопившиеся за интервал
+            while len(batch) < AUDIT_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._audit_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _AUDIT_STOP:
+                    # Пакет дописывается, после чего поток завершается
+                    self._audit_queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            try:
+                self.certificate_repo.add_verification_records_batch(batch)
+            except Exception as e:
+                logger.error(f"Ошибка записи истории проверок ({len(batch)} записей): {e}")
+            finally:
+                for _ in batch:
+                    self._audit_queue.task_done()
+
+    def _submit_save(self, certificate: Certificate):
+        """
+        Ставит сохранение сертификата в файловое хранилище в фоновую очередь.
+
+        Записи одного сертификата выполняются в порядке постановки.
+
+        Args:
+            certificate: Сертификат для сохранения
+        """
+        certificate_id = certificate.certificate_id
+        with self._save_lock:
+            previous = self._save_tails.get(certificate_id)
+            future = self._io_pool.submit(self._safe_save, certificate, previous)
+            self._save_tails[certificate_id] = future
+            self._pending_saves.add(future)
+        future.add_done_callback(partial(self._on_save_done, certificate_id))
+
+    def _on_save_done(self, certificate_id: str, future: Future):
+        """
+        Убирает завершенную запись файла из очереди ожидания.
+
+        Args:
+            certificate_id: ID сертификата
+            future: Завершенная запись
+        """
+        with self._save_lock:
+            self._pending_saves.discard(future)
+            if self._save_tails.get(certificate_id) is future:
+                del self._save_tails[certificate_id]
+
+    def _safe_save(self, certificate: Certificate, previous: Optional[Future] = None):
+        """
+        Сохраняет сертификат в файловое хранилище, не пробрасывая ошибки.
+
+        Args:
+            certificate: Сертификат для сохранения
+            previous: Предыдущая запись того же сертификата
+        """
+        # Пул выбирает задачи по очереди, поэтому предыдущая запись
+        # уже выполняется или завершена и ожидание не блокирует пул
+        if previous is not None:
+            wait([previous])
+
+        try:
+            result = self.storage_manager.save_certificate_complete(certificate)
+            if result["file_saved"]:
+                logger.info(f"Сертификат {certificate.certificate_id} сохранен в файловое хранилище")
+            else:
+                logger.warning(f"Ошибка сохранения сертификата в файл: {'; '.join(result['errors'])}")
+        except Exception as e:
+            logger.warning(f"Ошибка сохранения сертификата в файл: {e}")
 
     def validate_certificate_data(self, domain: str, inn: str, valid_from: date,
                                   valid_to: date, users_count: int) -> List[str]:
@@ -327,31 +749,32 @@ class CertificateService:
         """
         status = certificate.status_info
 
-        info = [
-            f"🆔 ID: {certificate.certificate_id}",
-            f"🌐 Домен: {certificate.domain}",
-            f"🏢 ИНН: {certificate.inn}",
-            f"📅 Период: {certificate.validity_period}",
-            f"👥 Пользователей: {certificate.users_count}",
-            f"{status['emoji']} Статус: {status['text']}"
-        ]
+        info = [_CERT_INFO_TMPL.format(
+            certificate.certificate_id,
+            certificate.domain,
+            certificate.inn,
+            certificate.validity_period,
+            certificate.users_count,
+            status['emoji'],
+            status['text']
+        )]
 
         if certificate.request_email:
             info.append(f"📧 Email для запросов: {certificate.request_email}")
 
         if certificate.contacts:
-            contacts_lines = []
-            for c in certificate.contacts:
-                contacts_lines.append(f"  • {c.get('name', '')} ({c.get('email', '')})")
-            info.append("👤 Контактные лица:\n" + "\n".join(contacts_lines))
+            contacts_lines = "\n".join(
+                f"  • {c.get('name', '')} ({c.get('email', '')})" for c in certificate.contacts
+            )
+            info.append(f"👤 Контактные лица:\n{contacts_lines}")
 
         if detailed:
             # Безопасно обрабатываем имя создателя
             creator_name = certificate.creator_display_name or f"ID: {certificate.created_by}"
-            info.extend([
-                f"📝 Создан: {certificate.created_at.strftime('%d.%m.%Y %H:%M')}",
+            info.append(
+                f"📝 Создан: {certificate.created_at:%d.%m.%Y %H:%M}\n"
                 f"🔧 Создатель: {creator_name}"
-            ])
+            )
 
         return "\n".join(info)
 
@@ -371,23 +794,16 @@ class CertificateService:
             return "📝 Сертификаты не найдены"
 
         items = []
+        append = items.append
+        get_formatter = _STATUS_FORMATTERS.get
+
         for i, cert in enumerate(certificates[:max_items], 1):
             status = cert.status_info
-            emoji = status['emoji']
 
             # Краткая информация о статусе
-            if status['status'] == 'not_started':
-                status_text = f"начнется {cert.valid_from.strftime('%d.%m')}"
-            elif status['status'] in ['expired']:
-                status_text = f"истек {cert.valid_to.strftime('%d.%m')}"
-            elif status['status'] in ['expiring_very_soon', 'expiring_soon']:
-                status_text = f"{status['days_left']}д"
-            elif status['status'] == 'active':
-                status_text = f"{status['days_left']}д"
-            else:
-                status_text = "неактивен"
+            status_text = get_formatter(status['status'], _format_inactive)(status, cert)
 
-            items.append(f"{i}. {emoji} {cert.domain} ({cert.certificate_id[:11]}...) - {status_text}")
+            append(f"{i}. {status['emoji']} {cert.domain} ({cert.certificate_id[:11]}...) - {status_text}")
 
         result = "\n".join(items)
 
@@ -406,39 +822,84 @@ class CertificateService:
         Returns:
             Certificate: Pydantic модель сертификата
         """
-        # Получаем значения с проверкой на None
-        is_active = getattr(db_certificate, 'is_active', True)
-        if is_active is None:
-            is_active = True
+        return self._convert_many((db_certificate,))[0]
 
-        created_by = getattr(db_certificate, 'created_by', '0')
-        try:
-            created_by_int = int(created_by) if created_by else 0
-        except (ValueError, TypeError):
-            created_by_int = 0
-
-        return Certificate(
-            id=str(db_certificate.id),
-            certificate_id=db_certificate.certificate_id,
-            domain=db_certificate.domain,
-            inn=db_certificate.inn,
-            valid_from=db_certificate.valid_from,
-            valid_to=db_certificate.valid_to,
-            users_count=db_certificate.users_count,
-            created_at=db_certificate.created_at,
-            created_by=created_by_int,
-            created_by_username=getattr(db_certificate, 'created_by_username', None),
-            created_by_full_name=getattr(db_certificate, 'created_by_full_name', None),
-            is_active=is_active,
-            request_email=getattr(db_certificate, 'request_email', None),
-            contacts=getattr(db_certificate, 'contacts', None)
-        )
+    def _convert_many(self, db_certificates) -> List[Certificate]:
+        """
+        Пакетно конвертирует объекты БД в Pydantic модели.
+
+        Данные из БД уже прошли валидацию при создании, поэтому модели
+        собираются через model_construct без повторной валидации.
+
+        Args:
+            db_certificates: Объекты сертификатов из БД
+
+        Returns:
+            List[Certificate]: Pydantic модели сертификатов
+        """
+        construct = Certificate.model_construct
+        certificates = []
+
+        for db_certificate in db_certificates:
+            values = _extract_db_fields(db_certificate)
+            fields = dict(zip(_DB_FIELDS, values))
+            db_id, is_active, created_by = values[-3:]
+
+            # Получаем значения с проверкой на None
+            fields['id'] = str(db_id)
+            fields['is_active'] = True if is_active is None else is_active
+
+            # Записи из файлов и старых импортов могут содержать нечисловой created_by
+            try:
+                fields['created_by'] = int(created_by) if created_by else 0
+            except (ValueError, TypeError):
+                fields['created_by'] = 0
+
+            certificates.append(construct(**fields))
+
+        return certificates
 
 
-# Глобальный экземпляр сервиса
-certificate_service = CertificateService()
+# Глобальный экземпляр сервиса, создается при первом обращении
+_certificate_service: Optional[CertificateService] = None
+_certificate_service_lock = threading.Lock()
 
 
 def get_certificate_service() -> CertificateService:
-    """Возвращает экземпляр сервиса сертификатов."""
-    return certificate_service
\ No newline at end of file
+    """
+    Возвращает экземпляр сервиса сертификатов.
+
+    Сервис создается при первом вызове, поэтому модули обработчиков получают
+    его внутри обработчиков, а не при импорте.
+    """
+    global _certificate_service
+    if _certificate_service is None:
+        with _certificate_service_lock:
+            if _certificate_service is None:
+                _certificate_service = CertificateService()
+    return _certificate_service
+
+
+def flush_certificate_service(timeout: Optional[float] = None):
+    """
+    Дожидается фоновых записей сервиса, если он уже создан.
+
+    Args:
+        timeout: Максимальное время ожидания в секундах
+    """
+    if _certificate_service is not None:
+        _certificate_service.flush(timeout)
+
+
+def close_certificate_service(timeout: Optional[float] = None):
+    """
+    Дописывает фоновые записи и останавливает сервис, если он уже создан.
+
+    Args:
+        timeout: Максимальное время ожидания в секундах
+    """
+    global _certificate_service
+    with _certificate_service_lock:
+        service, _certificate_service = _certificate_service, None
+    if service is not None:
+        service.close(timeout)
@@ -3,24 +3,65 @@
 """
 
 import json
+import mmap
 import os
+import queue
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from itertools import repeat
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Iterable, Tuple
 from .models import Certificate
 from .exceptions import StorageError
 from config.settings import get_settings
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+# Токены сканера бэкапа: строки целиком (с экранированием), скобки
+# и одиночная кавычка - начало незакрытой строки
+_BACKUP_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\]"]', re.DOTALL)
+# Параллельная запись файлов при восстановлении из бэкапа
+RESTORE_WRITE_WORKERS = 8
+RESTORE_WRITE_BATCH = 256
+# Размер пакета при импорте файлов в БД
+SYNC_BATCH_SIZE = 500
+
+
+def _json_dumps(data, pretty: bool = False) -> bytes:
+    """Сериализует данные в JSON, компактно или с отступами (orjson, если установлен)."""
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, option=option)
+    if pretty:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _json_loads(raw: bytes):
+    """Декодирует JSON из bytes (orjson, если установлен)."""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
 
 class FileStorage:
     """Менеджер файлового хранилища сертификатов."""
 
-    def __init__(self, base_path: Path = None):
+    def __init__(self, base_path: Path = None, pretty: bool = False, fsync: bool = False):
         """
         Инициализация файлового хранилища.
 
         Args:
             base_path: Базовый путь к директории сертификатов
+            pretty: Сохранять JSON с отступами для чтения человеком
+            fsync: Сбрасывать данные файлов сертификатов на диск перед закрытием
         """
         if base_path is None:
             settings = get_settings()
@@ -28,6 +69,24 @@ class FileStorage:
 
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
+        self._pretty = pretty
+        self._fsync = fsync
+        self._base_str = os.fspath(self.base_path)
+
+        # Список годовых директорий кэшируется до изменения базовой директории
+        self._year_dirs: Optional[List[Tuple[str, str]]] = None
+        self._year_dirs_mtime = None
+
+        # Файлы, которые не удалось прочитать при последнем пакетном чтении
+        self.last_errors: List[str] = []
+
+        # Индекс certificate_id -> путь относительно базовой директории.
+        # Хранится только в памяти процесса и заполняется по мере сохранения
+        # и поиска файлов: бот и веб-приложение работают с одним архивом,
+        # поэтому общий файл индекса перезаписывали бы друг у друга.
+        # Неверная запись (файл удален другим процессом) сбрасывается при промахе
+        self._index: Dict[str, str] = {}
+        self._index_lock = threading.Lock()
 
     def save_certificate(self, certificate: Certificate) -> Path:
         """
@@ -49,43 +108,62 @@ class FileStorage:
             year = certificate.created_at.year
 
             # Создаем директорию для года
-            year_dir = self.base_path / str(year)
-            year_dir.mkdir(parents=True, exist_ok=True)
+            year_dir = f"{self._base_str}/{year}"
+            os.makedirs(year_dir, exist_ok=True)
 
             # Формируем имя файла: domain_certificateID.json
             filename = f"{certificate.domain}_{certificate.certificate_id}.json"
-            file_path = year_dir / filename
+            file_path = f"{year_dir}/{filename}"
 
             # Подготавливаем данные для сохранения
             certificate_data = certificate.to_dict()
 
             # Сохраняем в JSON файл
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(certificate_data, f, ensure_ascii=False, indent=2)
+            self._write_file(file_path, _json_dumps(certificate_data, self._pretty), self._fsync)
+
+            self._update_index(added={certificate.certificate_id: f"{year}/{filename}"})
 
-            return file_path
+            return Path(file_path)
 
         except Exception as e:
             raise StorageError(f"Ошибка сохранения сертификата в файл: {e}")
 
-    def load_certificate(self, certificate_id: str) -> Optional[Dict]:
+    def load_certificate(self, certificate_id: str, year: int = None,
+                         domain: str = None) -> Optional[Dict]:
         """
         Загружает сертификат из JSON файла по ID.
 
         Args:
             certificate_id: ID сертификата
+            year: Год создания сертификата (если известен)
+            domain: Доменное имя (если известно)
 
         Returns:
             Optional[Dict]: Данные сертификата или None если не найден
         """
         try:
-            # Ищем файл во всех годовых директориях
-            for year_dir in self.base_path.iterdir():
-                if year_dir.is_dir() and year_dir.name.isdigit():
-                    # Ищем файлы с нужным certificate_id
-                    for file_path in year_dir.glob(f"*_{certificate_id}.json"):
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            return json.load(f)
+            # Год и домен однозначно задают путь к файлу
+            if year is not None and domain:
+                try:
+                    return self._load_json_file(
+                        f"{self._base_str}/{year}/{domain}_{certificate_id}.json"
+                    )
+                except FileNotFoundError:
+                    return None
+
+            # Иначе пробуем путь из индекса
+            relative_path = self._index.get(certificate_id)
+            if relative_path is not None:
+                try:
+                    return self._load_json_file(f"{self._base_str}/{relative_path}")
+                except FileNotFoundError:
+                    self._update_index(removed=[certificate_id])
+
+            # Файл мог быть создан другим процессом: ищем во всех годовых директориях
+            for entry in self._iter_cert_files(suffix=f"_{certificate_id}.json"):
+                data = self._load_json_file(entry.path)
+                self._update_index(added={certificate_id: self._relative_path(entry)})
+                return data
 
             return None
 
@@ -102,19 +180,12 @@ class FileStorage:
         Returns:
             List[Dict]: Список найденных сертификатов
         """
-        certificates = []
-
         try:
-            # Ищем во всех годовых директориях
-            for year_dir in self.base_path.iterdir():
-                if year_dir.is_dir() and year_dir.name.isdigit():
-                    # Ищем файлы с нужным доменом
-                    for file_path in year_dir.glob(f"{domain}_*.json"):
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            certificate_data = json.load(f)
-                            certificates.append(certificate_data)
-
-            return certificates
+            # Файлы домена во всех годовых директориях читаются по мере обхода
+            file_paths = (
+                entry.path for entry in self._iter_cert_files(prefix=f"{domain}_", prefetch=True)
+            )
+            return self._load_json_files(file_paths, skip_errors=False)
 
         except Exception as e:
             raise StorageError(f"Ошибка поиска сертификатов по домену: {e}")
@@ -126,27 +197,248 @@ class FileStorage:
         Returns:
             List[Dict]: Список всех сертификатов
         """
-        certificates = []
-
         try:
-            # Проходим по всем годовым директориям
-            for year_dir in self.base_path.iterdir():
-                if year_dir.is_dir() and year_dir.name.isdigit():
-                    # Читаем все JSON файлы
-                    for file_path in year_dir.glob("*.json"):
-                        try:
-                            with open(file_path, 'r', encoding='utf-8') as f:
-                                certificate_data = json.load(f)
-                                certificates.append(certificate_data)
-                        except Exception as e:
-                            print(f"Ошибка чтения файла {file_path}: {e}")
-                            continue
-
-            return certificates
+            # Пути поступают по мере обхода, декодирование идет параллельно с ним
+            file_paths = (entry.path for entry in self._iter_cert_files(prefetch=True))
+            return self._load_json_files(file_paths, skip_errors=True)
 
         except Exception as e:
             raise StorageError(f"Ошибка получения всех сертификатов: {e}")
 
+    def _get_year_dirs(self) -> List[Tuple[str, str]]:
+        """
+        Возвращает годовые директории хранилища.
+
+        Список строится одним проходом os.scandir и переиспользуется, пока
+        не изменится mtime базовой директории (например, другим процессом).
+
+        Returns:
+            List[Tuple[str, str]]: Пары (год, путь к директории) по возрастанию года
+        """
+        mtime = os.stat(self._base_str).st_mtime_ns
+        if self._year_dirs is None or mtime != self._year_dirs_mtime:
+            with os.scandir(self._base_str) as entries:
+                self._year_dirs = sorted(
+                    (entry.name, entry.path) for entry in entries
+                    if entry.name.isdigit() and entry.is_dir()
+                )
+            self._year_dirs_mtime = mtime
+        return self._year_dirs
+
+    def _iter_cert_files(self, prefix: str = "", suffix: str = ".json",
+                         prefetch: bool = False) -> Iterator[os.DirEntry]:
+        """
+        Перебирает файлы сертификатов во всех годовых директориях.
+
+        Имена сравниваются через startswith/endswith без fnmatch и лишних stat.
+
+        Args:
+            prefix: Требуемое начало имени файла
+            suffix: Требуемое окончание имени файла
+            prefetch: Читать листинг следующего года в фоне, пока
+                обрабатываются файлы текущего
+
+        Returns:
+            Iterator[os.DirEntry]: Записи подходящих файлов
+        """
+        year_paths = [year_path for _, year_path in self._get_year_dirs()]
+
+        if prefetch and len(year_paths) > 1:
+            for listing in self._prefetch_listings(year_paths, prefix, suffix):
+                yield from listing
+            return
+
+        for year_path in year_paths:
+            yield from self._list_year_dir(year_path, prefix, suffix)
+
+    @staticmethod
+    def _list_year_dir(year_path: str, prefix: str, suffix: str) -> List[os.DirEntry]:
+        """
+        Возвращает подходящие файлы одной годовой директории.
+
+        Args:
+            year_path: Путь к годовой директории
+            prefix: Требуемое начало имени файла
+            suffix: Требуемое окончание имени файла
+
+        Returns:
+            List[os.DirEntry]: Записи подходящих файлов
+        """
+        with os.scandir(year_path) as entries:
+            return [
+                entry for entry in entries
+                if entry.name.endswith(suffix) and entry.name.startswith(prefix)
+            ]
+
+    def _prefetch_listings(self, year_paths: List[str], prefix: str,
+                           suffix: str) -> Iterator[List[os.DirEntry]]:
+        """
+        Отдает листинги годовых директорий, читая следующий в фоновом потоке.
+
+        Очередь на один элемент: пока потребитель обрабатывает файлы года N,
+        фоновый поток выполняет scandir для года N+1.
+
+        Args:
+            year_paths: Пути к годовым директориям
+            prefix: Требуемое начало имени файла
+            suffix: Требуемое окончание имени файла
+
+        Returns:
+            Iterator[List[os.DirEntry]]: Листинги в порядке годов
+        """
+        listings = queue.Queue(maxsize=1)
+        stop = threading.Event()
+        done = object()
+
+        def put(item) -> bool:
+            # Ждем свободного места, пока потребитель не прекратил обход
+            while not stop.is_set():
+                try:
+                    listings.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def producer():
+            try:
+                for year_path in year_paths:
+                    if not put(self._list_year_dir(year_path, prefix, suffix)):
+                        return
+            except Exception as e:
+                put(e)
+            put(done)
+
+        threading.Thread(target=producer, name="certificate-listing", daemon=True).start()
+
+        try:
+            while True:
+                item = listings.get()
+                if item is done:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+
+    @staticmethod
+    def _certificate_id_from_filename(filename: str) -> str:
+        """Извлекает ID сертификата из имени файла domain_certificateID.json."""
+        return filename[:-5].rsplit("_", 1)[-1]
+
+    def _relative_path(self, entry: os.DirEntry) -> str:
+        """Возвращает путь файла относительно базовой директории (YYYY/имя)."""
+        return f"{os.path.basename(os.path.dirname(entry.path))}/{entry.name}"
+
+    def _update_index(self, added: Dict[str, str] = None, removed: Iterable[str] = None) -> None:
+        """
+        Обновляет индекс путей в памяти.
+
+        Args:
+            added: Новые записи certificate_id -> путь
+            removed: ID удаляемых записей
+        """
+        with self._index_lock:
+            if added:
+                self._index.update(added)
+            for certificate_id in removed or ():
+                self._index.pop(certificate_id, None)
+
+    @staticmethod
+    def _read_file(file_path) -> bytes:
+        """
+        Читает файл целиком через os.read, минуя слои буферизации Python.
+
+        Args:
+            file_path: Путь к файлу
+
+        Returns:
+            bytes: Содержимое файла
+        """
+        fd = os.open(file_path, os.O_RDONLY)
+        try:
+            return FileStorage._read_fd(fd, os.fstat(fd).st_size)
+        finally:
+            os.close(fd)
+
+    @staticmethod
+    def _read_fd(fd: int, size: int) -> bytes:
+        """
+        Дочитывает открытый файл до конца через os.read.
+
+        Args:
+            fd: Дескриптор файла
+            size: Ожидаемый размер файла
+
+        Returns:
+            bytes: Содержимое файла
+        """
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(size, 4096))
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _load_json_file(file_path):
+        """
+        Читает и декодирует один JSON файл.
+
+        Args:
+            file_path: Путь к файлу
+
+        Returns:
+            Декодированные данные
+        """
+        return _json_loads(FileStorage._read_file(file_path))
+
+    def _load_json_files(self, file_paths: Iterable[str], skip_errors: bool) -> List[Dict]:
+        """
+        Читает и декодирует пакет JSON файлов сертификатов.
+
+        Файлы обрабатываются последовательно: декодирование JSON (и json,
+        и orjson) держит GIL, поэтому пул потоков ускорял бы только чтение
+        маленьких файлов, а пересылка словарей из пула процессов стоит
+        столько же, сколько само декодирование.
+
+        Пропущенные файлы сохраняются в last_errors, а в лог пишется одна
+        итоговая строка вместо сообщения на каждый файл.
+
+        Args:
+            file_paths: Пути к файлам
+            skip_errors: Пропускать нечитаемые файлы вместо выброса исключения
+
+        Returns:
+            List[Dict]: Данные сертификатов в порядке путей
+        """
+        certificates = []
+        errors = []
+
+        for file_path in file_paths:
+            try:
+                certificates.append(self._load_json_file(file_path))
+            except Exception:
+                if not skip_errors:
+                    raise
+                errors.append(file_path)
+
+        self._report_errors(errors)
+        return certificates
+
+    def _report_errors(self, errors: List[str]) -> None:
+        """
+        Сохраняет пути нечитаемых файлов и выводит итоговое сообщение.
+
+        Args:
+            errors: Пути файлов, которые не удалось прочитать
+        """
+        self.last_errors = errors
+        if errors:
+            print(f"Ошибка чтения файлов сертификатов: {len(errors)} (первый: {errors[0]})")
+
     def delete_certificate(self, certificate_id: str, domain: str = None) -> bool:
         """
         Удаляет файл сертификата.
@@ -159,21 +451,33 @@ class FileStorage:
             bool: True если файл удален, False если не найден
         """
         try:
-            # Если известен домен, ищем более эффективно
+            # Если известен домен, проверяем точное имя файла в каждом году
             if domain:
-                for year_dir in self.base_path.iterdir():
-                    if year_dir.is_dir() and year_dir.name.isdigit():
-                        file_path = year_dir / f"{domain}_{certificate_id}.json"
-                        if file_path.exists():
-                            file_path.unlink()
-                            return True
+                filename = f"{domain}_{certificate_id}.json"
+                for _, year_path in self._get_year_dirs():
+                    try:
+                        os.unlink(os.path.join(year_path, filename))
+                    except FileNotFoundError:
+                        continue
+                    self._update_index(removed=[certificate_id])
+                    return True
             else:
-                # Ищем во всех директориях
-                for year_dir in self.base_path.iterdir():
-                    if year_dir.is_dir() and year_dir.name.isdigit():
-                        for file_path in year_dir.glob(f"*_{certificate_id}.json"):
-                            file_path.unlink()
-                            return True
+                # Пробуем путь из индекса, затем ищем во всех директориях
+                relative_path = self._index.get(certificate_id)
+                if relative_path is not None:
+                    try:
+                        os.unlink(f"{self._base_str}/{relative_path}")
+                        self._update_index(removed=[certificate_id])
+                        return True
+                    except FileNotFoundError:
+                        pass
+
+                for entry in self._iter_cert_files(suffix=f"_{certificate_id}.json"):
+                    os.unlink(entry.path)
+                    self._update_index(removed=[certificate_id])
+                    return True
+
+                self._update_index(removed=[certificate_id])
 
             return False
 
@@ -195,16 +499,32 @@ class FileStorage:
             backup_path = self.base_path.parent / f"certificates_backup_{timestamp}.json"
 
         try:
-            all_certificates = self.get_all_certificates()
+            total_certificates = 0
+            errors = []
 
-            backup_data = {
-                "created_at": datetime.now().isoformat(),
-                "total_certificates": len(all_certificates),
-                "certificates": all_certificates
-            }
+            # Пишем JSON потоком: в памяти находится только текущий сертификат
+            with open(backup_path, 'wb') as f:
+                f.write(b'{"created_at": ' + _json_dumps(datetime.now().isoformat()))
+                f.write(b', "certificates": [\n')
+
+                for entry in self._iter_cert_files(prefetch=True):
+                    try:
+                        raw = self._read_file(entry.path)
+                        # Проверяем, что файл содержит корректный JSON
+                        _json_loads(raw)
+                    except Exception:
+                        errors.append(entry.path)
+                        continue
+
+                    if total_certificates:
+                        f.write(b',\n')
+                    f.write(raw.strip())
+                    total_certificates += 1
+
+                # Количество известно только после обхода, поэтому пишется в конце
+                f.write(b'\n], "total_certificates": %d}' % total_certificates)
 
-            with open(backup_path, 'w', encoding='utf-8') as f:
-                json.dump(backup_data, f, ensure_ascii=False, indent=2)
+            self._report_errors(errors)
 
             return backup_path
 
@@ -222,45 +542,181 @@ class FileStorage:
             int: Количество восстановленных сертификатов
         """
         try:
-            with open(backup_path, 'r', encoding='utf-8') as f:
-                backup_data = json.load(f)
-
-            certificates = backup_data.get('certificates', [])
             restored_count = 0
+            restored = {}
+            created_years = set()
+            pending = []
+
+            with open(backup_path, 'rb') as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer, \
+                    ThreadPoolExecutor(max_workers=RESTORE_WRITE_WORKERS,
+                                       thread_name_prefix="certificate-restore") as executor:
+                # Структура проверяется целиком до записи первого файла
+                items = self._scan_backup_items(buffer)
+
+                for start, end in items:
+                    raw = buffer[start:end]
+                    cert_data = {}
+                    try:
+                        # Декодируем только ради полей пути, файл пишется исходными байтами
+                        cert_data = _json_loads(raw)
 
-            for cert_data in certificates:
-                try:
-                    # Создаем объект Certificate для сохранения
-                    # Преобразуем строковые даты обратно в объекты datetime/date
-                    cert_data_copy = cert_data.copy()
+                        # Определяем год из created_at
+                        created_at = datetime.fromisoformat(cert_data['created_at'])
+                        year = created_at.year
 
-                    # Определяем год из created_at
-                    created_at = datetime.fromisoformat(cert_data['created_at'])
-                    year = created_at.year
+                        # Создаем директорию для года один раз за восстановление
+                        year_dir = f"{self._base_str}/{year}"
+                        if year not in created_years:
+                            os.makedirs(year_dir, exist_ok=True)
+                            created_years.add(year)
 
-                    # Создаем директорию для года
-                    year_dir = self.base_path / str(year)
-                    year_dir.mkdir(parents=True, exist_ok=True)
+                        # Формируем путь к файлу
+                        filename = f"{cert_data['domain']}_{cert_data['certificate_id']}.json"
+                        pending.append(
+                            (cert_data['certificate_id'], f"{year}/{filename}", f"{year_dir}/{filename}", raw)
+                        )
 
-                    # Формируем путь к файлу
-                    filename = f"{cert_data['domain']}_{cert_data['certificate_id']}.json"
-                    file_path = year_dir / filename
+                    except Exception as e:
+                        print(f"Ошибка восстановления сертификата {cert_data.get('certificate_id', 'unknown')}: {e}")
+                        continue
 
-                    # Сохраняем файл
-                    with open(file_path, 'w', encoding='utf-8') as f:
-                        json.dump(cert_data, f, ensure_ascii=False, indent=2)
+                    # Записи выполняются пакетами, чтобы не держать в памяти весь бэкап
+                    if len(pending) >= RESTORE_WRITE_BATCH:
+                        restored_count += self._write_restored_batch(executor, pending, restored)
+                        pending = []
 
-                    restored_count += 1
+                restored_count += self._write_restored_batch(executor, pending, restored)
 
-                except Exception as e:
-                    print(f"Ошибка восстановления сертификата {cert_data.get('certificate_id', 'unknown')}: {e}")
-                    continue
+            self._update_index(added=restored)
 
             return restored_count
 
         except Exception as e:
             raise StorageError(f"Ошибка восстановления из резервной копии: {e}")
 
+    def _write_restored_batch(self, executor: ThreadPoolExecutor, pending: List[tuple],
+                              restored: Dict[str, str]) -> int:
+        """
+        Параллельно записывает пакет восстановленных файлов сертификатов.
+
+        Args:
+            executor: Пул потоков записи
+            pending: Кортежи (ID, относительный путь, полный путь, содержимое)
+            restored: Словарь для записей индекса успешно записанных файлов
+
+        Returns:
+            int: Количество записанных файлов
+        """
+        written = 0
+        results = executor.map(
+            self._write_file,
+            [item[2] for item in pending],
+            [item[3] for item in pending],
+            repeat(self._fsync)
+        )
+
+        for item in pending:
+            try:
+                next(results)
+            except Exception as e:
+                print(f"Ошибка восстановления сертификата {item[0]}: {e}")
+                continue
+            restored[item[0]] = item[1]
+            written += 1
+
+        return written
+
+    @staticmethod
+    def _scan_backup_items(buffer) -> List[tuple]:
+        """
+        Находит объекты массива certificates в буфере резервной копии.
+
+        Сканер проходит только по строкам и скобкам, не декодируя JSON:
+        содержимое строк пропускается регулярным выражением целиком.
+        Буфер проверяется до конца еще до записи файлов, поэтому
+        обрезанный или поврежденный бэкап не восстанавливается частично.
+
+        Args:
+            buffer: Содержимое бэкапа (bytes или mmap)
+
+        Returns:
+            List[tuple]: Пары (начало, конец) байтов каждого сертификата
+
+        Raises:
+            ValueError: Если структура бэкапа повреждена
+        """
+        stack = []
+        items = []
+        last_key = None
+        found = False
+        in_certificates = False
+        closed = False
+        item_start = 0
+
+        for match in _BACKUP_TOKEN_RE.finditer(buffer):
+            position = match.start()
+            char = buffer[position]
+
+            if closed:
+                raise ValueError(f"лишние данные после конца бэкапа (позиция {position})")
+
+            if char == 0x22:  # '"'
+                if match.end() - position == 1:
+                    raise ValueError(f"незакрытая строка (позиция {position})")
+                if len(stack) == 1:
+                    last_key = match.group()
+                continue
+
+            if char in (0x7B, 0x5B):  # '{' или '['
+                if not stack and char != 0x7B:
+                    raise ValueError("бэкап должен быть JSON-объектом")
+                stack.append(char)
+                depth = len(stack)
+                if depth == 2 and char == 0x5B and last_key == b'"certificates"':
+                    in_certificates = found = True
+                elif in_certificates and depth == 3 and char == 0x7B:
+                    item_start = position
+                continue
+
+            # '}' закрывает '{' (0x7D - 0x7B == 2), ']' закрывает '[' (0x5D - 0x5B == 2)
+            if not stack or stack.pop() != char - 2:
+                raise ValueError(f"непарная скобка (позиция {position})")
+            depth = len(stack)
+            if in_certificates and depth == 2 and char == 0x7D:
+                items.append((item_start, match.end()))
+            elif in_certificates and depth == 1:
+                in_certificates = False
+            closed = not stack
+
+        if not closed:
+            raise ValueError("бэкап обрезан: не закрыты скобки")
+        if not found:
+            raise ValueError("в бэкапе нет массива certificates")
+
+        return items
+
+    @staticmethod
+    def _write_file(file_path, data: bytes, fsync: bool = False) -> None:
+        """
+        Записывает байты в файл через os.write без буферизованного ввода-вывода.
+
+        Args:
+            file_path: Путь к файлу
+            data: Содержимое файла
+            fsync: Вызвать fdatasync перед закрытием файла
+        """
+        fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+            if fsync:
+                getattr(os, "fdatasync", os.fsync)(fd)
+        finally:
+            os.close(fd)
+
     def cleanup_old_files(self, days_old: int = 365) -> int:
         """
         Удаляет старые файлы сертификатов.
@@ -274,27 +730,70 @@ class FileStorage:
         try:
             from datetime import timedelta
 
-            cutoff_date = datetime.now() - timedelta(days=days_old)
+            cutoff_timestamp = (datetime.now() - timedelta(days=days_old)).timestamp()
             deleted_count = 0
+            deleted_ids = []
+
+            for _, year_path in self._get_year_dirs():
+                # Сначала собираем устаревшие файлы года (stat из записи scandir)
+                with os.scandir(year_path) as entries:
+                    expired = [
+                        entry.name for entry in entries
+                        if entry.name.endswith(".json") and entry.stat().st_mtime < cutoff_timestamp
+                    ]
+
+                if not expired:
+                    continue
 
-            for year_dir in self.base_path.iterdir():
-                if year_dir.is_dir() and year_dir.name.isdigit():
-                    for file_path in year_dir.glob("*.json"):
-                        # Проверяем время модификации файла
-                        file_mtime = datetime.fromtimestamp(file_path.stat().st_mtime)
+                # Затем удаляем пакетом через unlinkat относительно дескриптора директории
+                for name in self._unlink_batch(year_path, expired):
+                    deleted_ids.append(self._certificate_id_from_filename(name))
+                    deleted_count += 1
 
-                        if file_mtime < cutoff_date:
-                            try:
-                                file_path.unlink()
-                                deleted_count += 1
-                            except Exception as e:
-                                print(f"Ошибка удаления файла {file_path}: {e}")
+            self._update_index(removed=deleted_ids)
 
             return deleted_count
 
         except Exception as e:
             raise StorageError(f"Ошибка очистки старых файлов: {e}")
 
+    @staticmethod
+    def _unlink_batch(dir_path: str, names: List[str]) -> List[str]:
+        """
+        Удаляет пакет файлов одной директории.
+
+        Где поддерживается dir_fd, имена разрешаются относительно открытого
+        дескриптора директории без повторного разбора полного пути.
+
+        Args:
+            dir_path: Путь к директории
+            names: Имена удаляемых файлов
+
+        Returns:
+            List[str]: Имена успешно удаленных файлов
+        """
+        deleted = []
+        dir_fd = None
+
+        if os.unlink in os.supports_dir_fd:
+            dir_fd = os.open(dir_path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+
+        try:
+            for name in names:
+                try:
+                    if dir_fd is not None:
+                        os.unlink(name, dir_fd=dir_fd)
+                    else:
+                        os.unlink(os.path.join(dir_path, name))
+                    deleted.append(name)
+                except Exception as e:
+                    print(f"Ошибка удаления файла {os.path.join(dir_path, name)}: {e}")
+        finally:
+            if dir_fd is not None:
+                os.close(dir_fd)
+
+        return deleted
+
     def get_storage_stats(self) -> Dict:
         """
         Получает статистику файлового хранилища.
@@ -307,22 +806,21 @@ class FileStorage:
             total_size = 0
             years = []
 
-            for year_dir in self.base_path.iterdir():
-                if year_dir.is_dir() and year_dir.name.isdigit():
-                    years.append(year_dir.name)
-                    year_files = 0
+            for year, year_path in self._get_year_dirs():
+                years.append(year)
 
-                    for file_path in year_dir.glob("*.json"):
-                        total_files += 1
-                        year_files += 1
-                        total_size += file_path.stat().st_size
+                with os.scandir(year_path) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".json"):
+                            total_files += 1
+                            total_size += entry.stat().st_size
 
             return {
                 "total_files": total_files,
                 "total_size_bytes": total_size,
                 "total_size_mb": round(total_size / 1024 / 1024, 2),
-                "years_covered": sorted(years),
-                "base_path": str(self.base_path)
+                "years_covered": years,
+                "base_path": self._base_str
             }
 
         except Exception as e:
@@ -372,18 +870,21 @@ class CertificateStorageManager:
 
         return result
 
-    def load_certificate_complete(self, certificate_id: str) -> Optional[Dict]:
+    def load_certificate_complete(self, certificate_id: str, year: int = None,
+                                  domain: str = None) -> Optional[Dict]:
         """
         Загружает сертификат из файлового хранилища.
 
         Args:
             certificate_id: ID сертификата
+            year: Год создания сертификата (если известен)
+            domain: Доменное имя (если известно)
 
         Returns:
             Optional[Dict]: Данные сертификата или None
         """
         try:
-            return self.file_storage.load_certificate(certificate_id)
+            return self.file_storage.load_certificate(certificate_id, year, domain)
         except Exception as e:
             print(f"Ошибка загрузки сертификата {certificate_id}: {e}")
             return None
@@ -422,20 +923,145 @@ class CertificateStorageManager:
 
         return result
 
+    def sync_files_to_database(self, batch_size: int = SYNC_BATCH_SIZE) -> Dict:
+        """
+        Импортирует в БД сертификаты из файлового хранилища, которых там нет.
+
+        Сертификаты вставляются пакетами: один INSERT на пакет вместо
+        отдельного запроса на каждый сертификат.
+
+        Args:
+            batch_size: Количество сертификатов в одном INSERT
+
+        Returns:
+            Dict: Результат импорта
+        """
+        from .database import get_certificate_repo
+
+        repo = get_certificate_repo()
+        result = {
+            "imported_count": 0,
+            "skipped_count": 0,
+            "errors": [],
+            "total_files": 0
+        }
+
+        try:
+            existing_ids = repo.get_existing_certificate_ids()
+            batch = []
+
+            for cert_data in self.file_storage.get_all_certificates():
+                result["total_files"] += 1
+
+                if cert_data.get("certificate_id") in existing_ids:
+                    result["skipped_count"] += 1
+                    continue
+
+                try:
+                    row = self._file_data_to_db(cert_data)
+                except Exception as e:
+                    result["errors"].append(
+                        f"Ошибка разбора {cert_data.get('certificate_id', 'unknown')}: {e}"
+                    )
+                    continue
+
+                # Повтор ID в другом файле пропускается так же, как уже импортированный
+                existing_ids.add(row["certificate_id"])
+                batch.append(row)
+
+                if len(batch) >= batch_size:
+                    self._insert_sync_batch(repo, batch, result)
+                    batch = []
+
+            if batch:
+                self._insert_sync_batch(repo, batch, result)
+
+        except Exception as e:
+            result["errors"].append(f"Ошибка импорта в БД: {e}")
+
+        return result
+
+    @staticmethod
+    def _insert_sync_batch(repo, batch: List[Dict], result: Dict) -> None:
+        """
+        Вставляет пакет импорта в БД, при ошибке пакета - по одному сертификату.
+
+        Args:
+            repo: Репозиторий сертификатов
+            batch: Данные строк для вставки
+            result: Результат импорта, пополняется счетчиком и ошибками
+        """
+        try:
+            result["imported_count"] += len(repo.bulk_insert(batch))
+            return
+        except Exception as e:
+            result["errors"].append(f"Ошибка пакетной вставки ({len(batch)} сертификатов): {e}")
+
+        # Отдельные вставки находят строки, из-за которых не прошел пакет
+        for row in batch:
+            try:
+                result["imported_count"] += len(repo.bulk_insert([row]))
+            except Exception as e:
+                result["errors"].append(f"Ошибка импорта {row['certificate_id']}: {e}")
+
+    @staticmethod
+    def _file_data_to_db(cert_data: Dict) -> Dict:
+        """
+        Преобразует данные файла сертификата в данные строки БД.
+
+        Args:
+            cert_data: Данные из JSON файла
+
+        Returns:
+            Dict: Данные для вставки в таблицу certificates
+        """
+        valid_from, valid_to = (
+            datetime.strptime(part, "%d.%m.%Y").date()
+            for part in cert_data["validity_period"].split("-")
+        )
+
+        return {
+            "certificate_id": cert_data["certificate_id"],
+            "domain": cert_data["domain"],
+            "inn": cert_data["inn"],
+            "valid_from": valid_from,
+            "valid_to": valid_to,
+            "users_count": cert_data["users_count"],
+            "created_at": datetime.fromisoformat(cert_data["created_at"]),
+            "created_by": str(cert_data["created_by"]),
+            "created_by_username": cert_data.get("created_by_username"),
+            "created_by_full_name": cert_data.get("created_by_full_name"),
+            "is_active": cert_data.get("is_active", True),
+            "request_email": cert_data.get("request_email"),
+            "contacts": cert_data.get("contacts")
+        }
+
 
-# Глобальный экземпляр файлового хранилища
-file_storage = FileStorage()
-storage_manager = CertificateStorageManager(file_storage)
+# Глобальные экземпляры хранилища, создаются при первом обращении
+_file_storage: Optional[FileStorage] = None
+_storage_manager: Optional[CertificateStorageManager] = None
+_storage_lock = threading.Lock()
 
 
 def get_file_storage() -> FileStorage:
     """Возвращает экземпляр файлового хранилища."""
-    return file_storage
+    global _file_storage
+    if _file_storage is None:
+        with _storage_lock:
+            if _file_storage is None:
+                _file_storage = FileStorage()
+    return _file_storage
 
 
 def get_storage_manager() -> CertificateStorageManager:
     """Возвращает менеджер хранилища."""
-    return storage_manager
+    global _storage_manager
+    if _storage_manager is None:
+        file_storage = get_file_storage()
+        with _storage_lock:
+            if _storage_manager is None:
+                _storage_manager = CertificateStorageManager(file_storage)
+    return _storage_manager
 
 
 if __name__ == "__main__":
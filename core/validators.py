@@ -5,74 +5,263 @@
 """
 
 import re
-from datetime import date, datetime
-from typing import List, Tuple
+import time
+from functools import lru_cache
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
 from .exceptions import *
 
+# Максимальная длина части домена
+_DOMAIN_PART_MAX = 63
+# Часть домена: 1-63 символа, дефисы допустимы, но не в начале/конце
+_DOMAIN_LABEL = r'[a-zA-Z0-9](?:[a-zA-Z0-9-]{0,%d}[a-zA-Z0-9])?' % (_DOMAIN_PART_MAX - 2)
+# Полный домен за один проход: необязательный wildcard и минимум 2 части.
+# Повторения ограничены, поэтому время проверки линейно по длине строки
+_DOMAIN_RE = re.compile(r'^(?:\*\.)?(?:%s\.)+%s$' % (_DOMAIN_LABEL, _DOMAIN_LABEL))
+# Допустимые символы части домена - для сообщения о причине ошибки
+_DOMAIN_PART_CHARS_RE = re.compile(r'^[a-zA-Z0-9-]+$')
+# Весовые коэффициенты контрольных цифр ИНН
+_INN10_COEFFS = (2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN11_COEFFS = (7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+_INN12_COEFFS = (3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8)
+# Поправки на ASCII-код '0' (48): sum((b - 48) * k) == sum(b * k) - 48 * sum(k)
+_INN10_OFFSET = 48 * sum(_INN10_COEFFS)
+_INN11_OFFSET = 48 * sum(_INN11_COEFFS)
+_INN12_OFFSET = 48 * sum(_INN12_COEFFS)
+# ASCII-цифры: после удаления их из строки ИНН не должно остаться символов
+_ASCII_DIGITS = b'0123456789'
+# Максимальный период действия сертификата (5 лет)
+MAX_PERIOD = timedelta(days=5 * 365.25)
+# Минимальное количество пользователей сертификата
+_MIN_USERS = 1
+# Размер кэша результатов валидации строковых значений
+_VALIDATION_CACHE_SIZE = 4096
+
+# Период DD.MM.YYYY-DD.MM.YYYY; день и месяц, как у strptime, из 1-2 цифр
+_PERIOD_RE = re.compile(
+    r'^\s*([0-9]{1,2})\.([0-9]{1,2})\.([0-9]{4})\s*-\s*([0-9]{1,2})\.([0-9]{1,2})\.([0-9]{4})\s*$'
+)
+
+# Допустимые символы блоков ID сертификата ([A-Z0-9]) в виде ASCII-байтов
+_CERTIFICATE_ID_ALNUM = b'0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+# Текущая дата и минута, в которую она получена
+_today_cache: Optional[Tuple[int, date]] = None
+
+
+def _today() -> date:
+    """Возвращает текущую дату, пересчитывая ее не чаще раза в минуту."""
+    global _today_cache
+    minute = int(time.time()) // 60
+    cached = _today_cache
+    if cached is not None and cached[0] == minute:
+        return cached[1]
+    today = date.today()
+    _today_cache = (minute, today)
+    return today
+
+
+def _parse_ddmmyyyy(value: str) -> date:
+    """
+    Разбирает дату в формате DD.MM.YYYY без strptime.
+
+    Как и strptime("%d.%m.%Y"), допускает день и месяц из одной цифры.
+
+    Raises:
+        ValueError: При несоответствии формату или несуществующей дате
+    """
+    day, _, rest = value.partition('.')
+    month, _, year = rest.partition('.')
+    if (not 1 <= len(day) <= 2 or not 1 <= len(month) <= 2 or len(year) != 4
+            or _ascii_digits(day + month + year) is None):
+        raise ValueError(f"'{value}' не соответствует формату DD.MM.YYYY")
+    return date(int(year), int(month), int(day))
+
+
+def _ascii_digits(value: str) -> Optional[bytes]:
+    """
+    Возвращает ASCII-байты строки, если она непуста и состоит только из цифр 0-9.
+
+    В отличие от str.isdigit не пропускает цифры других алфавитов.
+    """
+    b = value.encode('ascii', 'ignore')
+    if not b or len(b) != len(value) or b.translate(None, _ASCII_DIGITS):
+        return None
+    return b
+
+
+def _inn_10_check_digit(b: bytes) -> int:
+    """Контрольная цифра 10-значного ИНН по ASCII-байтам первых 9 цифр."""
+    checksum = (b[0] * 2 + b[1] * 4 + b[2] * 10 + b[3] * 3 + b[4] * 5
+                + b[5] * 9 + b[6] * 4 + b[7] * 6 + b[8] * 8 - _INN10_OFFSET)
+    # Остаток 10 дает контрольную цифру 0
+    r = checksum % 11
+    return 0 if r == 10 else r
+
+
+def _inn_12_check_digits(b: bytes) -> Tuple[int, int]:
+    """
+    Обе контрольные цифры 12-значного ИНН (11-й и 12-й разряды) за один проход.
+
+    Байты цифр читаются один раз и используются в обеих взвешенных суммах.
+    """
+    b0, b1, b2, b3, b4, b5, b6, b7, b8, b9, b10 = b[:11]
+    checksum_11 = (b0 * 7 + b1 * 2 + b2 * 4 + b3 * 10 + b4 * 3
+                   + b5 * 5 + b6 * 9 + b7 * 4 + b8 * 6 + b9 * 8 - _INN11_OFFSET)
+    checksum_12 = (b0 * 3 + b1 * 7 + b2 * 2 + b3 * 4 + b4 * 10 + b5 * 3
+                   + b6 * 5 + b7 * 9 + b8 * 4 + b9 * 6 + b10 * 8 - _INN12_OFFSET)
+    r11 = checksum_11 % 11
+    r12 = checksum_12 % 11
+    return 0 if r11 == 10 else r11, 0 if r12 == 10 else r12
+
+
+def _validate_bin_kz(bin_kz: str) -> bool:
+    """
+    Валидация БИН Казахстана (упрощенная).
+    Формат БИН: ГГММXXXXXX## (12 цифр)
+    ГГ - год, МM - месяц регистрации
+
+    Args:
+        bin_kz: БИН для валидации
+
+    Returns:
+        bool: True если БИН валиден по формату
+    """
+    if len(bin_kz) != 12:
+        return False
 
-class DomainValidator:
-    """Валидатор доменных имен с поддержкой wildcard."""
+    # Проверяем месяц (позиции 2-3, должно быть от 01 до 12)
+    try:
+        month = int(bin_kz[2:4])
+        if month < 1 or month > 12:
+            return False
+        return True
+    except ValueError:
+        return False
 
-    def __init__(self):
-        # Паттерн для валидации части домена (может содержать дефисы, но не в начале/конце)
-        self.domain_part_pattern = re.compile(r'^[a-zA-Z0-9]([a-zA-Z0-9-]*[a-zA-Z0-9])?$')
-        # Паттерн для полного домена
-        self.domain_pattern = re.compile(r'^(\*\.)?[a-zA-Z0-9]([a-zA-Z0-9.-]*[a-zA-Z0-9])?$')
 
-    def validate(self, domain: str) -> bool:
-        """
-        Валидация доменного имени.
+# Валидация строк - чистые функции от одного значения, поэтому результаты
+# кэшируются: одни и те же домены и ИНН повторяются между запросами
 
-        Args:
-            domain: Доменное имя для валидации
+@lru_cache(maxsize=_VALIDATION_CACHE_SIZE)
+def validate_domain_cached(domain: str) -> bool:
+    """Проверка доменного имени (см. DomainValidator.validate)."""
+    if not domain or len(domain) > 255:
+        return False
 
-        Returns:
-            bool: True если домен валиден, False иначе
-        """
-        if not domain or len(domain) > 255:
-            return False
+    return _DOMAIN_RE.match(domain) is not None
 
-        # Проверяем общий формат
-        if not self.domain_pattern.match(domain):
-            return False
 
-        # Обрабатываем wildcard
-        if domain.startswith('*.'):
-            domain = domain[2:]  # Убираем '*.'
+@lru_cache(maxsize=_VALIDATION_CACHE_SIZE)
+def validate_inn_cached(inn: str) -> bool:
+    """Проверка ИНН РФ или БИН Казахстана (см. INNValidator.validate)."""
+    b = _ascii_digits(inn) if inn else None
+    if b is None:
+        return False
 
-        # Разделяем на части
-        parts = domain.split('.')
+    if len(b) == 10:
+        return b[9] - 48 == _inn_10_check_digit(b)
+    elif len(b) == 12:
+        # Пробуем сначала как ИНН РФ: сверяем обе контрольные цифры
+        if _inn_12_check_digits(b) == (b[10] - 48, b[11] - 48):
+            return True
+        # Если не прошел как ИНН РФ, проверяем как БИН Казахстана
+        return _validate_bin_kz(inn)
 
-        # Должно быть минимум 2 части (например, site.com)
-        if len(parts) < 2:
-            return False
+    return False
 
-        # Валидируем каждую часть
-        for part in parts:
-            if not self._validate_domain_part(part):
-                return False
 
-        return True
+def domain_error(domain: str) -> Optional[str]:
+    """
+    Определяет, почему доменное имя не прошло проверку.
 
-    def _validate_domain_part(self, part: str) -> bool:
+    Разбор по частям выполняется только для невалидного домена,
+    валидный проверяется кэшированным validate_domain_cached.
+
+    Args:
+        domain: Доменное имя
+
+    Returns:
+        Optional[str]: Сообщение об ошибке или None, если домен валиден
+    """
+    if validate_domain_cached(domain):
+        return None
+
+    if not domain or len(domain) > 255:
+        return f"Некорректная длина домена: {domain}"
+
+    # Обрабатываем wildcard
+    test_domain = domain[2:] if domain.startswith('*.') else domain
+
+    parts = test_domain.split('.')
+    if len(parts) < 2:
+        return f"Домен должен содержать минимум 2 части: {domain}"
+
+    for part in parts:
+        if not part or len(part) > _DOMAIN_PART_MAX:
+            return f"Некорректная часть домена: {part}"
+        if part.startswith('-') or part.endswith('-'):
+            return f"Часть домена не может начинаться или заканчиваться дефисом: {part}"
+        if not _DOMAIN_PART_CHARS_RE.match(part):
+            return f"Некорректные символы в части домена: {part}"
+
+    return f"Некорректный формат домена: {domain}"
+
+
+def inn_error(inn: str) -> Optional[str]:
+    """
+    Определяет, почему ИНН/БИН не прошел проверку.
+
+    Args:
+        inn: ИНН РФ или БИН Казахстана
+
+    Returns:
+        Optional[str]: Сообщение об ошибке или None, если ИНН/БИН валиден
+    """
+    if validate_inn_cached(inn):
+        return None
+
+    if not inn or _ascii_digits(inn) is None:
+        return f"ИНН/БИН должен содержать только цифры: {inn}"
+    if len(inn) == 10:
+        return f"Некорректная контрольная сумма ИНН: {inn}"
+    if len(inn) == 12:
+        # Не прошел ни как ИНН РФ, ни как БИН Казахстана
+        return f"Некорректный формат ИНН/БИН: {inn}"
+    return f"ИНН/БИН должен содержать 10 или 12 цифр: {inn}"
+
+
+@lru_cache(maxsize=_VALIDATION_CACHE_SIZE)
+def _validate_certificate_id_cached(certificate_id: str) -> bool:
+    """Проверка формата ID сертификата (см. CertificateIDValidator.validate)."""
+    # Формат фиксированный: 4 блока по 5 символов, разделители на позициях 5, 11, 17
+    if (not certificate_id or len(certificate_id) != 23
+            or certificate_id[5] != '-' or certificate_id[11] != '-'
+            or certificate_id[17] != '-' or not certificate_id.isascii()):
+        return False
+
+    # После удаления [A-Z0-9] должны остаться только три разделителя
+    return certificate_id.encode('ascii').translate(None, _CERTIFICATE_ID_ALNUM) == b'---'
+
+
+class DomainValidator:
+    """Валидатор доменных имен с поддержкой wildcard."""
+
+    def validate(self, domain: str) -> bool:
         """
-        Валидация отдельной части домена.
+        Валидация доменного имени.
+
+        Формат, wildcard, число частей и длина каждой части проверяются
+        одним совпадением регулярного выражения без разбиения на части.
 
         Args:
-            part: Часть домена для валидации
+            domain: Доменное имя для валидации
 
         Returns:
-            bool: True если часть валидна, False иначе
+            bool: True если домен валиден, False иначе
         """
-        if not part or len(part) > 63:
-            return False
-
-        # Не может начинаться или заканчиваться дефисом
-        if part.startswith('-') or part.endswith('-'):
-            return False
-
-        # Проверяем паттерн
-        return bool(self.domain_part_pattern.match(part))
+        return validate_domain_cached(domain)
 
     def get_domain_examples(self) -> List[str]:
         """Возвращает примеры валидных доменов."""
@@ -100,70 +289,8 @@ class INNValidator:
         Returns:
             bool: True если ИНН/БИН валиден, False иначе
         """
-        if not inn or not inn.isdigit():
-            return False
-    
-        if len(inn) == 10:
-            return self._validate_inn_10(inn)
-        elif len(inn) == 12:
-            # Пробуем сначала как ИНН РФ
-            if self._validate_inn_12(inn):
-                return True
-            # Если не прошел как ИНН РФ, проверяем как БИН Казахстана
-            return self._validate_bin_kz(inn)
-    
-        return False
-
-    def _validate_inn_10(self, inn: str) -> bool:
-        """Валидация 10-значного ИНН."""
-        coefficients = [2, 4, 10, 3, 5, 9, 4, 6, 8]
-
-        checksum = sum(int(inn[i]) * coefficients[i] for i in range(9))
-        control_digit = (checksum % 11) % 10
-
-        return int(inn[9]) == control_digit
-
-    def _validate_inn_12(self, inn: str) -> bool:
-        """Валидация 12-значного ИНН."""
-        # Проверяем первую контрольную цифру
-        coefficients_1 = [7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
-        checksum_1 = sum(int(inn[i]) * coefficients_1[i] for i in range(10))
-        control_digit_1 = (checksum_1 % 11) % 10
+        return validate_inn_cached(inn)
 
-        if int(inn[10]) != control_digit_1:
-            return False
-
-        # Проверяем вторую контрольную цифру
-        coefficients_2 = [3, 7, 2, 4, 10, 3, 5, 9, 4, 6, 8]
-        checksum_2 = sum(int(inn[i]) * coefficients_2[i] for i in range(11))
-        control_digit_2 = (checksum_2 % 11) % 10
-
-        return int(inn[11]) == control_digit_2
-
-
-    def _validate_bin_kz(self, bin_kz: str) -> bool:
-        """
-        Валидация БИН Казахстана (упрощенная).
-        Формат БИН: ГГММXXXXXX## (12 цифр)
-        ГГ - год, МM - месяц регистрации
-        
-        Args:
-            bin_kz: БИН для валидации
-            
-        Returns:
-            bool: True если БИН валиден по формату
-        """
-        if len(bin_kz) != 12:
-            return False
-        
-        # Проверяем месяц (позиции 2-3, должно быть от 01 до 12)
-        try:
-            month = int(bin_kz[2:4])
-            if month < 1 or month > 12:
-                return False
-            return True
-        except ValueError:
-            return False
 
 class PeriodValidator:
     """Валидатор периода действия сертификата."""
@@ -179,10 +306,8 @@ class PeriodValidator:
         Returns:
             Tuple[bool, str]: (валиден ли период, сообщение об ошибке)
         """
-        today = date.today()
-
         # Проверяем, что даты не в прошлом
-        if valid_from < today:
+        if valid_from < _today():
             return False, "Дата начала не может быть в прошлом"
 
         # Проверяем, что дата окончания позже даты начала
@@ -190,8 +315,7 @@ class PeriodValidator:
             return False, "Дата окончания должна быть позже даты начала"
 
         # Проверяем, что период не превышает 5 лет
-        years_diff = (valid_to - valid_from).days / 365.25
-        if years_diff > 5:
+        if valid_to - valid_from > MAX_PERIOD:
             return False, "Период действия не может превышать 5 лет"
 
         return True, ""
@@ -209,13 +333,23 @@ class PeriodValidator:
         Raises:
             PeriodValidationError: При некорректном формате
         """
+        # Основной путь: формат проверяется и разбирается одним совпадением
+        match = _PERIOD_RE.match(period)
+        if match is not None:
+            d1, m1, y1, d2, m2, y2 = map(int, match.groups())
+            try:
+                return date(y1, m1, d1), date(y2, m2, d2)
+            except ValueError as e:
+                raise PeriodValidationError(f"Неверный формат даты: {e}")
+
+        # Строка не соответствует формату - разбираем по частям ради точного сообщения
         try:
-            date_parts = period.split('-')
-            if len(date_parts) != 2:
+            date_from, separator, date_to = period.partition('-')
+            if not separator or '-' in date_to:
                 raise PeriodValidationError("Неверный формат периода. Используйте DD.MM.YYYY-DD.MM.YYYY")
 
-            valid_from = datetime.strptime(date_parts[0].strip(), "%d.%m.%Y").date()
-            valid_to = datetime.strptime(date_parts[1].strip(), "%d.%m.%Y").date()
+            valid_from = _parse_ddmmyyyy(date_from.strip())
+            valid_to = _parse_ddmmyyyy(date_to.strip())
 
             return valid_from, valid_to
 
@@ -236,17 +370,13 @@ class UsersCountValidator:
         Returns:
             bool: True если количество валидно, False иначе
         """
-        # Убрано верхнее ограничение, оставлено только минимальное значение 1
-        return isinstance(users_count, int) and users_count >= 1
+        # Убрано верхнее ограничение, оставлено только минимальное значение
+        return type(users_count) is int and users_count >= _MIN_USERS
 
 
 class CertificateIDValidator:
     """Валидатор ID сертификата."""
 
-    def __init__(self):
-        # Паттерн для валидации ID сертификата: XXXXX-XXXXX-XXXXX-XXXXX
-        self.pattern = re.compile(r'^[A-Z0-9]{5}-[A-Z0-9]{5}-[A-Z0-9]{5}-[A-Z0-9]{5}$')
-
     def validate(self, certificate_id: str) -> bool:
         """
         Валидация ID сертификата.
@@ -257,10 +387,7 @@ class CertificateIDValidator:
         Returns:
             bool: True если ID валиден, False иначе
         """
-        if not certificate_id or len(certificate_id) != 23:
-            return False
-
-        return bool(self.pattern.match(certificate_id))
+        return _validate_certificate_id_cached(certificate_id)
 
     def validate_ending(self, certificate_id: str, expected_month: int, expected_year: int) -> bool:
         """
@@ -277,34 +404,38 @@ class CertificateIDValidator:
         if not self.validate(certificate_id):
             return False
 
-        # Извлекаем последние 4 символа
-        ending = certificate_id[-4:]
+        # Последние 4 символа - месяц (MM) и год (YY); формат ID допускает
+        # в них буквы, поэтому сначала проверяем, что это ASCII-цифры
+        b = _ascii_digits(certificate_id[-4:])
+        if b is None:
+            return False
 
-        # Последние 2 цифры - месяц и год
-        try:
-            month_str = ending[2:4]  # Месяц
-            year_str = ending[4:6]   # Год (последние 2 цифры)
+        month = (b[0] - 48) * 10 + (b[1] - 48)
+        year = (b[2] - 48) * 10 + (b[3] - 48)
+        if not 1 <= month <= 12:
+            return False
 
-            # Конвертируем в числа
-            month = int(month_str)
-            year = int(year_str)
+        # Проверяем соответствие
+        return month == expected_month and year == (expected_year % 100)
 
-            # Проверяем соответствие
-            return month == expected_month and year == (expected_year % 100)
 
-        except (ValueError, IndexError):
-            return False
+# Валидаторы не хранят состояния, поэтому используются общие экземпляры
+_DOMAIN_VALIDATOR = DomainValidator()
+_INN_VALIDATOR = INNValidator()
+_PERIOD_VALIDATOR = PeriodValidator()
+_USERS_VALIDATOR = UsersCountValidator()
+_CERT_ID_VALIDATOR = CertificateIDValidator()
 
 
 class DataValidator:
     """Общий валидатор для всех типов данных."""
 
     def __init__(self):
-        self.domain_validator = DomainValidator()
-        self.inn_validator = INNValidator()
-        self.period_validator = PeriodValidator()
-        self.users_count_validator = UsersCountValidator()
-        self.certificate_id_validator = CertificateIDValidator()
+        self.domain_validator = _DOMAIN_VALIDATOR
+        self.inn_validator = _INN_VALIDATOR
+        self.period_validator = _PERIOD_VALIDATOR
+        self.users_count_validator = _USERS_VALIDATOR
+        self.certificate_id_validator = _CERT_ID_VALIDATOR
 
     def validate_all(self, domain: str, inn: str, valid_from: date,
                      valid_to: date, users_count: int) -> List[str]:
@@ -341,3 +472,38 @@ class DataValidator:
             errors.append(f"Количество пользователей должно быть больше 0: {users_count}")
 
         return errors
+
+
+_DATA_VALIDATOR = DataValidator()
+
+
+def validate_all(domain: str, inn: str, valid_from: date,
+                 valid_to: date, users_count: int) -> List[str]:
+    """
+    Валидация всех данных сертификата общим экземпляром DataValidator.
+
+    Args:
+        domain: Доменное имя
+        inn: ИНН
+        valid_from: Дата начала действия
+        valid_to: Дата окончания действия
+        users_count: Количество пользователей
+
+    Returns:
+        List[str]: Список ошибок валидации (пустой если все в порядке)
+    """
+    return _DATA_VALIDATOR.validate_all(domain, inn, valid_from, valid_to, users_count)
+
+
+def validate_period(valid_from: date, valid_to: date) -> Tuple[bool, str]:
+    """
+    Валидация периода действия общим экземпляром PeriodValidator.
+
+    Args:
+        valid_from: Дата начала действия
+        valid_to: Дата окончания действия
+
+    Returns:
+        Tuple[bool, str]: (валиден ли период, сообщение об ошибке)
+    """
+    return _PERIOD_VALIDATOR.validate(valid_from, valid_to)
@@ -81,6 +81,12 @@ CREATE INDEX IF NOT EXISTS idx_certificates_active_valid ON certificates(is_acti
     WHERE is_active = TRUE;
 CREATE INDEX IF NOT EXISTS idx_certificates_domain_active_valid ON certificates(domain, is_active, valid_to);
 
+-- Частичные индексы для выборок активных сертификатов по домену и создателю
+CREATE INDEX IF NOT EXISTS idx_certificate_domain_active_only ON certificates(domain, created_at)
+    WHERE is_active;
+CREATE INDEX IF NOT EXISTS idx_certificate_created_by_active_only ON certificates(created_by, created_at)
+    WHERE is_active;
+
 -- Индексы для таблицы certificate_history
 CREATE INDEX IF NOT EXISTS idx_history_certificate_id ON certificate_history(certificate_id);
 CREATE INDEX IF NOT EXISTS idx_history_performed_at ON certificate_history(performed_at);
@@ -5,6 +5,7 @@
 
 import sys
 import logging
+from datetime import datetime, timedelta
 from pathlib import Path
 
 # Добавляем корневую директорию в путь для импортов
@@ -14,6 +15,26 @@ from bot.main import run_bot
 from config.settings import get_settings, validate_settings, create_env_example
 
 
+def _warmup():
+    """
+    Прогрев валидаторов перед приемом запросов.
+
+    Первый вызов платит за ленивую инициализацию (таблицы _strptime,
+    внутренние кэши re), поэтому выполняем его до запуска бота.
+    """
+    from core.validators import DataValidator
+
+    validator = DataValidator()
+    today = datetime.now().date()
+    validator.validate_all("example.com", "7707083893",
+                           today + timedelta(days=1), today + timedelta(days=30), 10)
+    validator.certificate_id_validator.validate("A1B2C-D3E4F-G5H6I-J0524")
+    validator.period_validator.parse_period_string("01.01.2030-31.12.2030")
+
+    # Обработчики бота разбирают даты через strptime
+    datetime.strptime("01.01.2030", "%d.%m.%Y")
+
+
 def main():
     """Основная функция запуска."""
     print("🚀 Запуск системы управления сертификатами")
@@ -48,6 +69,9 @@ def main():
     # Создаем необходимые директории
     settings.create_directories()
 
+    # Прогреваем валидаторы до первого запроса
+    _warmup()
+
     # Запускаем бота
     print("\n🤖 Запуск Telegram бота...")
     try:
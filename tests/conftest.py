@@ -0,0 +1,66 @@
+"""
+Общие фикстуры тестов.
+"""
+
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+from sqlalchemy.ext.compiler import compiles
+
+from core.database import DatabaseManager, CertificateRepository
+
+
+# Тесты БД выполняются на SQLite: типы PostgreSQL отображаются на ближайшие аналоги
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(UUID, "sqlite")
+def _compile_uuid_sqlite(type_, compiler, **kw):
+    return "CHAR(32)"
+
+
+@pytest.fixture
+def db_manager(tmp_path):
+    """Менеджер БД поверх временного файла SQLite."""
+    manager = DatabaseManager(f"sqlite:///{tmp_path / 'test.db'}")
+    manager.create_tables()
+    yield manager
+    manager.engine.dispose()
+
+
+@pytest.fixture
+def certificate_repo(db_manager):
+    """Репозиторий сертификатов поверх временной БД."""
+    return CertificateRepository(db_manager)
+
+
+@pytest.fixture
+def pg_certificate_repo():
+    """
+    Репозиторий поверх PostgreSQL для запросов, которых нет в SQLite.
+
+    Адрес отдельной тестовой БД берется из TEST_DATABASE_URL: таблицы
+    создаются перед тестом и удаляются после него.
+    """
+    url = os.environ.get("TEST_DATABASE_URL")
+    if not url:
+        pytest.skip("TEST_DATABASE_URL не задан")
+
+    manager = DatabaseManager(url)
+    try:
+        with manager.engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+    except Exception as e:
+        manager.engine.dispose()
+        pytest.skip(f"PostgreSQL недоступен: {e}")
+
+    manager.drop_tables()
+    manager.create_tables()
+    yield CertificateRepository(manager)
+    manager.drop_tables()
+    manager.engine.dispose()
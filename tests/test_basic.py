@@ -5,16 +5,124 @@
 import pytest
 from datetime import date, timedelta
 from core.generator import CertificateIDGenerator
-from core.validator import DomainValidator, INNValidator, DataValidator
+from core.validators import (
+    DomainValidator, INNValidator, DataValidator, CertificateIDValidator, PeriodValidator,
+    domain_error, inn_error
+)
 from core.models import CertificateRequest
 
+# Фиксированная "сегодняшняя" дата: проверка "начало не в прошлом" не зависит
+# от момента запуска и смены суток во время прогона
+_TODAY = date(2025, 1, 15)
+# Строка периода формируется один раз при импорте, а не в каждом тесте
+_VALID_FROM = _TODAY + timedelta(days=1)
+_VALID_TO = _TODAY + timedelta(days=31)
+_VALID_PERIOD = f"{_VALID_FROM.strftime('%d.%m.%Y')}-{_VALID_TO.strftime('%d.%m.%Y')}"
+
+
+@pytest.fixture(autouse=True)
+def _freeze_today(monkeypatch):
+    monkeypatch.setattr('core.validators._today', lambda: _TODAY)
+
+
+@pytest.fixture(scope="module")
+def today():
+    return _TODAY
+
+
+# Наборы входных данных для параметризованных тестов
+_VALID_IDS = (
+    'A1B2C-D3E4F-G5H6I-J7K80',
+    'AAAAA-BBBBB-CCCCC-DDDDD',
+)
+
+_INVALID_IDS = (
+    'SHORT',
+    'TOOLONGIDENTIFIER',
+    'A1B2C-D3E4F-G5H6I',  # Неполный
+    'A1B2C_D3E4F_G5H6I_J7K80',  # Неверные разделители
+)
+
+_VALID_DOMAINS = (
+    'example.com',
+    'sub.example.com',
+    'my-site.com',
+    'test-domain.org',
+    '*.example.com',
+    '*.sub.example.com',
+    'site123.ru',
+    'a.b',
+)
+
+_INVALID_DOMAINS = (
+    '-example.com',  # Начинается с дефиса
+    'example-.com',  # Заканчивается дефисом
+    'example..com',  # Двойная точка
+    '*.*.example.com',  # Несколько wildcards
+    'example.*',  # Wildcard не в начале
+    'a',  # Слишком короткий
+    '',  # Пустой
+    'example.com' + 'a' * 250,  # Слишком длинный
+)
+
+_DOMAIN_ERROR_CASES = (
+    ('example.com', None),
+    ('localhost', 'Домен должен содержать минимум 2 части: localhost'),
+    ('-site.com', 'Часть домена не может начинаться или заканчиваться дефисом: -site'),
+    ('my_site.com', 'Некорректные символы в части домена: my_site'),
+    ('example..com', 'Некорректная часть домена: '),
+)
+
+_VALID_INNS_10 = (
+    '7707083893',  # Сбербанк
+    '7728168971',  # Альфа-банк
+)
+
+_INVALID_INNS = (
+    '123456789',    # 9 цифр
+    '12345678901',  # 11 цифр
+    '1234567890123',  # 13 цифр
+    'abcdefghij',   # Буквы
+    '1234567890',   # Неверная контрольная сумма
+    '',  # Пустой
+)
+
+_INN_ERROR_CASES = (
+    ('7707083893', None),
+    ('77070838a3', 'ИНН/БИН должен содержать только цифры: 77070838a3'),
+    ('1234567890', 'Некорректная контрольная сумма ИНН: 1234567890'),
+    ('123456789', 'ИНН/БИН должен содержать 10 или 12 цифр: 123456789'),
+)
+
+
+# Генератор и валидаторы не хранят состояние между вызовами,
+# поэтому создаются один раз на модуль
+
+@pytest.fixture(scope="module")
+def generator():
+    return CertificateIDGenerator()
+
+
+@pytest.fixture(scope="module")
+def domain_validator():
+    return DomainValidator()
+
+
+@pytest.fixture(scope="module")
+def inn_validator():
+    return INNValidator()
+
+
+@pytest.fixture(scope="module")
+def data_validator():
+    return DataValidator()
+
 
 class TestCertificateIDGenerator:
     """Тесты генератора ID сертификатов."""
 
-    def test_generate_valid_id(self):
+    def test_generate_valid_id(self, generator):
         """Тест генерации валидного ID."""
-        generator = CertificateIDGenerator()
         valid_to = date(2024, 5, 31)
 
         cert_id = generator.generate(valid_to)
@@ -23,29 +131,23 @@ class TestCertificateIDGenerator:
         assert cert_id.count('-') == 3
         assert cert_id.endswith('0524')  # Май 2024
 
-    def test_validate_id_format(self):
+    @pytest.mark.parametrize('cert_id', _VALID_IDS)
+    def test_validate_id_format(self, cert_id, generator):
         """Тест валидации формата ID."""
-        generator = CertificateIDGenerator()
-
-        # Валидные ID
-        assert generator.validate_id_format('A1B2C-D3E4F-G5H6I-J7K80')
-        assert generator.validate_id_format('AAAAA-BBBBB-CCCCC-DDDDD')
+        assert generator.validate_id_format(cert_id)
 
-        # Невалидные ID
-        assert not generator.validate_id_format('SHORT')
-        assert not generator.validate_id_format('TOOLONGIDENTIFIER')
-        assert not generator.validate_id_format('A1B2C-D3E4F-G5H6I')  # Неполный
-        assert not generator.validate_id_format('A1B2C_D3E4F_G5H6I_J7K80')  # Неверные разделители
+    @pytest.mark.parametrize('cert_id', _INVALID_IDS)
+    def test_invalid_id_format(self, cert_id, generator):
+        """Тест невалидных форматов ID."""
+        assert not generator.validate_id_format(cert_id)
 
-    def test_extract_expiry_date(self):
+    def test_extract_expiry_date(self, generator):
         """Тест извлечения даты окончания."""
-        generator = CertificateIDGenerator()
-
-        month, year = generator.extract_expiry_date('A1B2C-D3E4F-G5H6I-J7K0524')
+        month, year = generator.extract_expiry_date('A1B2C-D3E4F-G5H6I-J0524')
         assert month == 5
         assert year == 2024
 
-        month, year = generator.extract_expiry_date('A1B2C-D3E4F-G5H6I-J7K1225')
+        month, year = generator.extract_expiry_date('A1B2C-D3E4F-G5H6I-J1225')
         assert month == 12
         assert year == 2025
 
@@ -53,102 +155,99 @@ class TestCertificateIDGenerator:
 class TestDomainValidator:
     """Тесты валидатора доменов."""
 
-    def test_valid_domains(self):
+    @pytest.mark.parametrize('domain', _VALID_DOMAINS)
+    def test_valid_domains(self, domain, domain_validator):
         """Тест валидных доменов."""
-        validator = DomainValidator()
-
-        valid_domains = [
-            'example.com',
-            'sub.example.com',
-            'my-site.com',
-            'test-domain.org',
-            '*.example.com',
-            '*.sub.example.com',
-            'site123.ru',
-            'a.b'
-        ]
-
-        for domain in valid_domains:
-            assert validator.validate(domain), f"Домен {domain} должен быть валидным"
-
-    def test_invalid_domains(self):
-        """Тест невалидных доменов."""
-        validator = DomainValidator()
+        assert domain_validator.validate(domain), f"Домен {domain} должен быть валидным"
 
-        invalid_domains = [
-            '-example.com',  # Начинается с дефиса
-            'example-.com',  # Заканчивается дефисом
-            'example..com',  # Двойная точка
-            '*.*.example.com',  # Несколько wildcards
-            'example.*',  # Wildcard не в начале
-            'a',  # Слишком короткий
-            '',  # Пустой
-            'example.com' + 'a' * 250  # Слишком длинный
-        ]
+    @pytest.mark.parametrize('domain', _INVALID_DOMAINS)
+    def test_invalid_domains(self, domain, domain_validator):
+        """Тест невалидных доменов."""
+        assert not domain_validator.validate(domain), f"Домен {domain} должен быть невалидным"
 
-        for domain in invalid_domains:
-            assert not validator.validate(domain), f"Домен {domain} должен быть невалидным"
+    @pytest.mark.parametrize('domain, message', _DOMAIN_ERROR_CASES)
+    def test_domain_error(self, domain, message):
+        """Тест сообщения о причине ошибки домена."""
+        assert domain_error(domain) == message
 
 
 class TestINNValidator:
     """Тесты валидатора ИНН."""
 
-    def test_valid_inn_10(self):
+    @pytest.mark.parametrize('inn', _VALID_INNS_10)
+    def test_valid_inn_10(self, inn, inn_validator):
         """Тест валидного 10-значного ИНН."""
-        validator = INNValidator()
+        assert inn_validator.validate(inn), f"ИНН {inn} должен быть валидным"
+
+    def test_checksum_remainder_10(self, inn_validator):
+        """Тест ИНН, у которых остаток контрольной суммы равен 10 (цифра 0)."""
+        assert inn_validator.validate('7707083950')
+        assert not inn_validator.validate('7707083951')
+        # Оба остатка равны 10, месяц 00 не подходит для БИН - принимается только как ИНН РФ
+        assert inn_validator.validate('500000000100')
+        assert not inn_validator.validate('500000000101')
+
+    @pytest.mark.parametrize('inn', _INVALID_INNS)
+    def test_invalid_inn(self, inn, inn_validator):
+        """Тест невалидных ИНН."""
+        assert not inn_validator.validate(inn), f"ИНН {inn} должен быть невалидным"
 
-        # Примеры валидных 10-значных ИНН
-        valid_inns = [
-            '7707083893',  # Сбербанк
-            '5077746887',  # Альфа-банк
-        ]
+    @pytest.mark.parametrize('inn, message', _INN_ERROR_CASES)
+    def test_inn_error(self, inn, message):
+        """Тест сообщения о причине ошибки ИНН."""
+        assert inn_error(inn) == message
 
-        for inn in valid_inns:
-            assert validator.validate(inn), f"ИНН {inn} должен быть валидным"
 
-    def test_invalid_inn(self):
-        """Тест невалидных ИНН."""
-        validator = INNValidator()
+class TestCertificateIDValidator:
+    """Тесты валидатора ID сертификата."""
 
-        invalid_inns = [
-            '123456789',    # 9 цифр
-            '12345678901',  # 11 цифр
-            '1234567890123',  # 13 цифр
-            'abcdefghij',   # Буквы
-            '1234567890',   # Неверная контрольная сумма
-            '',  # Пустой
-        ]
+    def test_validate_ending(self):
+        """Тест проверки окончания ID (месяц и год)."""
+        validator = CertificateIDValidator()
 
-        for inn in invalid_inns:
-            assert not validator.validate(inn), f"ИНН {inn} должен быть невалидным"
+        assert validator.validate_ending('A1B2C-D3E4F-G5H6I-J0524', 5, 2024) is True
+        assert validator.validate_ending('A1B2C-D3E4F-G5H6I-J0524', 6, 2024) is False
+        assert validator.validate_ending('A1B2C-D3E4F-G5H6I-J0524', 5, 2025) is False
+        assert validator.validate_ending('A1B2C-D3E4F-G5H6I-JAB24', 5, 2024) is False
+        # Буква в позиции года или месяца не должна давать "подходящее" число
+        assert validator.validate_ending('A1B2C-D3E4F-G5H6I-J051A', 5, 2027) is False
+        assert validator.validate_ending('A1B2C-D3E4F-G5H6I-J0A24', 5, 2024) is False
+        assert validator.validate_ending('A1B2C-D3E4F-G5H6I-J1324', 13, 2024) is False
+
+
+class TestPeriodValidator:
+    """Тесты валидатора периода действия."""
+
+    def test_parse_period_string(self):
+        """Тест разбора строки периода."""
+        validator = PeriodValidator()
+
+        assert validator.parse_period_string(_VALID_PERIOD) == (_VALID_FROM, _VALID_TO)
+        assert validator.validate(_VALID_FROM, _VALID_TO) == (True, "")
 
 
 class TestDataValidator:
     """Тесты общего валидатора данных."""
 
-    def test_validate_all_valid_data(self):
+    def test_validate_all_valid_data(self, data_validator, today):
         """Тест валидации корректных данных."""
-        validator = DataValidator()
-
-        errors = validator.validate_all(
+        errors = data_validator.validate_all(
             domain='example.com',
             inn='7707083893',
-            valid_from=date.today(),
-            valid_to=date.today() + timedelta(days=365),
+            valid_from=today,
+            valid_to=today + timedelta(days=365),
             users_count=100
         )
 
         assert len(errors) == 0, f"Не должно быть ошибок валидации: {errors}"
 
-    def test_validate_all_invalid_data(self):
+    def test_validate_all_invalid_data(self, data_validator, today):
         """Тест валидации некорректных данных."""
-        validator = DataValidator()
-
-        errors = validator.validate_all(
+        errors = data_validator.validate_all(
             domain='-invalid.com',
             inn='123',
-            valid_from=date.today() + timedelta(days=365),  # Начало после окончания
-            valid_to=date.today(),
+            valid_from=today + timedelta(days=365),  # Начало после окончания
+            valid_to=today,
             users_count=2000  # Слишком много
         )
 
@@ -160,13 +259,13 @@ class TestDataValidator:
 class TestCertificateRequest:
     """Тесты модели запроса сертификата."""
 
-    def test_create_valid_request(self):
+    def test_create_valid_request(self, today):
         """Тест создания валидного запроса."""
         request = CertificateRequest(
             domain='example.com',
             inn='7707083893',
-            valid_from=date.today(),
-            valid_to=date.today() + timedelta(days=365),
+            valid_from=today,
+            valid_to=today + timedelta(days=365),
             users_count=100,
             created_by=123456789
         )
@@ -175,13 +274,13 @@ class TestCertificateRequest:
         assert request.inn == '7707083893'
         assert request.users_count == 100
 
-    def test_domain_normalization(self):
+    def test_domain_normalization(self, today):
         """Тест нормализации домена."""
         request = CertificateRequest(
             domain='EXAMPLE.COM',
             inn='7707083893',
-            valid_from=date.today(),
-            valid_to=date.today() + timedelta(days=365),
+            valid_from=today,
+            valid_to=today + timedelta(days=365),
             users_count=100,
             created_by=123456789
         )
@@ -190,4 +289,4 @@ class TestCertificateRequest:
 
 
 if __name__ == '__main__':
-    pytest.main(['-v', __file__])
\ No newline at end of file
+    pytest.main(['-v', __file__])
@@ -0,0 +1,184 @@
+"""
+Тесты репозитория сертификатов.
+"""
+
+from datetime import date, datetime
+
+import pytest
+
+from core.database import CertificateHistory
+from core.models import SearchRequest
+
+
+def _certificate_data(index: int) -> dict:
+    return {
+        "certificate_id": f"AAAAA-BBBBB-CCCCC-D{index:04d}",
+        "domain": f"site{index}.example.com",
+        "inn": "7707083893",
+        "valid_from": date(2025, 1, 1),
+        "valid_to": date(2025, 12, 31),
+        "users_count": 10,
+        "created_by": "123456789",
+    }
+
+
+class TestBulkInsert:
+    """Тесты пакетного создания сертификатов."""
+
+    def test_returns_certificates_in_input_order(self, certificate_repo):
+        """Тест возврата созданных сертификатов в порядке входных данных."""
+        certificates = certificate_repo.bulk_insert([_certificate_data(i) for i in range(3)])
+
+        assert [c.certificate_id for c in certificates] == [
+            "AAAAA-BBBBB-CCCCC-D0000",
+            "AAAAA-BBBBB-CCCCC-D0001",
+            "AAAAA-BBBBB-CCCCC-D0002",
+        ]
+        # Атрибуты доступны после закрытия сессии
+        assert certificates[0].domain == "site0.example.com"
+        assert certificates[0].created_at is not None
+
+    def test_writes_created_history(self, certificate_repo, db_manager):
+        """Тест записи истории 'created' для каждого сертификата."""
+        certificate_repo.bulk_insert([_certificate_data(i) for i in range(2)])
+
+        with db_manager.get_session() as session:
+            records = session.query(CertificateHistory).order_by(CertificateHistory.certificate_id).all()
+
+        assert [(r.certificate_id, r.action, r.performed_by) for r in records] == [
+            ("AAAAA-BBBBB-CCCCC-D0000", "created", "123456789"),
+            ("AAAAA-BBBBB-CCCCC-D0001", "created", "123456789"),
+        ]
+        assert records[0].details == {"domain": "site0.example.com", "inn": "7707083893"}
+
+    def test_empty_input(self, certificate_repo):
+        """Тест пустого списка."""
+        assert certificate_repo.bulk_insert([]) == []
+
+
+class TestVerificationRecordsBatch:
+    """Тесты пакетной записи истории проверок."""
+
+    def test_missing_details_stored_as_sql_null(self, certificate_repo, db_manager):
+        """Тест: запись без деталей хранит SQL NULL, а не JSON null."""
+        certificate_repo.bulk_insert([_certificate_data(1)])
+        certificate_id = _certificate_data(1)["certificate_id"]
+
+        certificate_repo.add_verification_records_batch([
+            (certificate_id, "42", None),
+            (certificate_id, "43", {"source": "api"}),
+        ])
+
+        with db_manager.get_session() as session:
+            rows = session.query(CertificateHistory.performed_by).filter(
+                CertificateHistory.action == "verified",
+                CertificateHistory.details.is_(None)
+            ).all()
+            details = session.query(CertificateHistory.details).filter(
+                CertificateHistory.performed_by == "43"
+            ).scalar()
+
+        assert [row.performed_by for row in rows] == ["42"]
+        assert details == {"source": "api"}
+
+
+class TestSearchPagination:
+    """Тесты постраничного поиска (keyset по created_at, certificate_id)."""
+
+    def _insert(self, certificate_repo, created_at_by_index):
+        rows = []
+        for index, created_at in created_at_by_index.items():
+            data = _certificate_data(index)
+            data["created_at"] = created_at
+            rows.append(data)
+        certificate_repo.bulk_insert(rows)
+
+    def _page_ids(self, certificate_repo, limit, after_id=None):
+        return [
+            c.certificate_id
+            for c in certificate_repo.search_certificates(limit=limit, after_id=after_id)
+        ]
+
+    def test_pages_cover_all_rows_with_created_at_ties(self, certificate_repo):
+        """Тест обхода всех страниц, когда у нескольких записей одинаковый created_at."""
+        same_time = datetime(2025, 1, 10, 12, 0, 0)
+        self._insert(certificate_repo, {
+            0: datetime(2025, 1, 9, 12, 0, 0),
+            1: same_time,
+            2: same_time,
+            3: same_time,
+            4: datetime(2025, 1, 11, 12, 0, 0),
+        })
+
+        pages = []
+        after_id = None
+        while True:
+            page = self._page_ids(certificate_repo, limit=2, after_id=after_id)
+            if not page:
+                break
+            pages.append(page)
+            after_id = page[-1]
+
+        # Сначала новые; при равном created_at - по убыванию ID
+        assert pages == [
+            ["AAAAA-BBBBB-CCCCC-D0004", "AAAAA-BBBBB-CCCCC-D0003"],
+            ["AAAAA-BBBBB-CCCCC-D0002", "AAAAA-BBBBB-CCCCC-D0001"],
+            ["AAAAA-BBBBB-CCCCC-D0000"],
+        ]
+
+    def test_no_limit_returns_everything(self, certificate_repo):
+        """Тест поиска без лимита."""
+        self._insert(certificate_repo, {i: datetime(2025, 1, 1 + i) for i in range(5)})
+
+        assert len(self._page_ids(certificate_repo, limit=None)) == 5
+
+    def test_unknown_cursor(self, certificate_repo):
+        """Тест курсора, которого нет в БД."""
+        self._insert(certificate_repo, {0: datetime(2025, 1, 1)})
+
+        assert self._page_ids(certificate_repo, limit=2, after_id="ZZZZZ-ZZZZZ-ZZZZZ-Z0000") == []
+
+    def test_search_request_is_unbounded_by_default(self):
+        """Тест: SearchRequest без явного лимита не ограничивает выдачу."""
+        assert SearchRequest(domain="example.com").limit is None
+
+
+@pytest.mark.db
+class TestUpdateDatesReturning:
+    """Тесты UPDATE ... FROM ... RETURNING (выполняется только в PostgreSQL)."""
+
+    def test_updates_dates_and_writes_history(self, pg_certificate_repo):
+        """Тест обновления дат и записи старых дат в историю."""
+        pg_certificate_repo.bulk_insert([_certificate_data(1)])
+
+        certificate = pg_certificate_repo.update_certificate_dates_returning(
+            "AAAAA-BBBBB-CCCCC-D0001", date(2025, 2, 1), date(2026, 2, 1), "42", "продление"
+        )
+
+        assert (certificate.valid_from, certificate.valid_to) == (date(2025, 2, 1), date(2026, 2, 1))
+        assert certificate.domain == "site1.example.com"
+
+        with pg_certificate_repo.db_manager.get_session() as session:
+            record = session.query(CertificateHistory).filter(
+                CertificateHistory.action == "dates_updated"
+            ).one()
+
+        assert (record.certificate_id, record.performed_by) == ("AAAAA-BBBBB-CCCCC-D0001", "42")
+        assert record.details == {
+            "old_valid_from": "2025-01-01",
+            "old_valid_to": "2025-12-31",
+            "new_valid_from": "2025-02-01",
+            "new_valid_to": "2026-02-01",
+            "reason": "продление",
+        }
+
+    def test_unknown_id(self, pg_certificate_repo):
+        """Тест: для несуществующего ID возвращается None, история не пишется."""
+        assert pg_certificate_repo.update_certificate_dates_returning(
+            "ZZZZZ-ZZZZZ-ZZZZZ-Z0000", date(2025, 2, 1), date(2026, 2, 1), "42"
+        ) is None
+
+        with pg_certificate_repo.db_manager.get_session() as session:
+            assert session.query(CertificateHistory).filter(
+                CertificateHistory.action == "dates_updated"
+            ).count() == 0
@@ -0,0 +1,330 @@
+"""
+Тесты сервиса сертификатов.
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from core.database import CertificateHistory
+from core.models import CertificateRequest, EditCertificateDatesRequest, SearchRequest
+from core.service import CertificateService, STATS_TTL
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def _run_python(code: str) -> subprocess.CompletedProcess:
+    """Запускает код в отдельном интерпретаторе с чистым sys.modules."""
+    return subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True
+    )
+
+
+class TestLazyImports:
+    """Тесты отложенной загрузки модулей пакета core."""
+
+    def test_service_does_not_load_storage(self):
+        """Тест: сервис загружает хранилище только при обращении к storage_manager."""
+        result = _run_python(
+            "import sys\n"
+            "from core.service import CertificateService\n"
+            "assert 'core.storage' not in sys.modules, 'storage imported eagerly'\n"
+            "import core\n"
+            "core.get_storage_manager\n"
+            "assert 'core.storage' in sys.modules\n"
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_flush_does_not_create_service(self, monkeypatch):
+        """Тест: остановка не создает сервис, который ни разу не понадобился."""
+        import core.service
+
+        monkeypatch.setattr(core.service, "_certificate_service", None)
+        core.service.flush_certificate_service()
+
+        assert core.service._certificate_service is None
+
+    def test_package_exports(self):
+        """Тест доступности публичных имен пакета."""
+        import core
+
+        assert set(core.__all__) <= set(dir(core))
+        assert core.DataValidator.__module__ == "core.validators"
+        assert callable(core.get_file_storage)
+
+
+class _FakeStorageManager:
+    """Файловое хранилище в памяти: запоминает сохраненные сертификаты."""
+
+    def __init__(self, save_delay: float = 0.0):
+        self.save_delay = save_delay
+        self.saved = []
+        self.files = {}
+        self.stats_calls = 0
+        self.file_storage = self
+
+    def save_certificate_complete(self, certificate):
+        delay = self.save_delay(certificate) if callable(self.save_delay) else self.save_delay
+        time.sleep(delay)
+        self.saved.append(certificate.certificate_id)
+        self.files[certificate.certificate_id] = certificate
+        return {"file_saved": True, "errors": []}
+
+    def get_storage_stats(self):
+        self.stats_calls += 1
+        return {"calls": self.stats_calls}
+
+
+@pytest.fixture
+def storage():
+    return _FakeStorageManager()
+
+
+@pytest.fixture
+def service(certificate_repo, storage, monkeypatch):
+    """Сервис поверх SQLite-репозитория и хранилища в памяти."""
+    # UPDATE ... FROM ... RETURNING со столбцами подзапроса есть только в PostgreSQL,
+    # на SQLite обновление дат собирается из двух запросов репозитория
+    def update_dates_returning(certificate_id, new_valid_from, new_valid_to, user_id, reason=None):
+        if not certificate_repo.update_certificate_dates(
+                certificate_id, new_valid_from, new_valid_to, user_id, reason):
+            return None
+        return certificate_repo.get_certificate_by_id(certificate_id)
+
+    monkeypatch.setattr(certificate_repo, "update_certificate_dates_returning", update_dates_returning)
+
+    certificate_service = CertificateService()
+    certificate_service.certificate_repo = certificate_repo
+    certificate_service.storage_manager = storage
+    yield certificate_service
+    certificate_service.close()
+
+
+def _request(domain: str = "example.com") -> CertificateRequest:
+    valid_from = date.today() + timedelta(days=1)
+    return CertificateRequest(
+        domain=domain,
+        inn="7707083893",
+        valid_from=valid_from,
+        valid_to=valid_from + timedelta(days=365),
+        users_count=10,
+        created_by=123456789
+    )
+
+
+def _history_actions(db_manager, certificate_id: str) -> list:
+    with db_manager.get_session() as session:
+        return [
+            row.action for row in session.query(CertificateHistory).filter(
+                CertificateHistory.certificate_id == certificate_id
+            )
+        ]
+
+
+class TestCreateCertificate:
+    """Тесты создания сертификата и кэша существующих ID."""
+
+    def test_id_cache_filled_on_create(self, service):
+        """Тест пополнения кэша ID созданным сертификатом."""
+        certificate, has_existing = service.create_certificate(_request())
+
+        assert has_existing is False
+        assert certificate.certificate_id in service._id_cache
+
+    def test_retry_on_duplicate_id(self, service, certificate_repo, monkeypatch):
+        """Тест повтора с перечитанным кэшем, если ID уже занят другим процессом."""
+        taken_id = "AAAAA-AAAAA-AAAAA-A0126"
+        fresh_id = "BBBBB-BBBBB-BBBBB-B0126"
+
+        # Кэш загружен до того, как другой процесс создал сертификат с taken_id
+        service._id_cache = set()
+        certificate_repo.bulk_insert([{
+            "certificate_id": taken_id, "domain": "other.com", "inn": "7707083893",
+            "valid_from": date(2025, 1, 1), "valid_to": date(2026, 1, 1),
+            "users_count": 1, "created_by": "1",
+        }])
+
+        def generate(valid_to, existing_ids):
+            return next(cid for cid in (taken_id, fresh_id) if cid not in existing_ids)
+
+        monkeypatch.setattr(service.id_generator, "generate", generate)
+
+        certificate, _ = service.create_certificate(_request())
+
+        assert certificate.certificate_id == fresh_id
+        assert {taken_id, fresh_id} <= service._id_cache
+        assert certificate_repo.get_certificate_by_id(fresh_id).domain == "example.com"
+
+
+class TestConvertMany:
+    """Тесты пакетной конвертации записей БД в модели."""
+
+    def test_non_numeric_created_by(self, service, certificate_repo):
+        """Тест: нечисловой created_by из импорта не ломает список сертификатов."""
+        certificate_repo.bulk_insert([{
+            "certificate_id": "AAAAA-AAAAA-AAAAA-A0126", "domain": "legacy.com", "inn": "7707083893",
+            "valid_from": date(2025, 1, 1), "valid_to": date(2026, 1, 1),
+            "users_count": 1, "created_by": "file_sync",
+        }])
+
+        certificates = service.search_certificates(SearchRequest(domain="legacy.com"))
+
+        assert [(c.domain, c.created_by) for c in certificates] == [("legacy.com", 0)]
+
+
+class TestLazyDependencies:
+    """Тесты отложенного создания зависимостей сервиса."""
+
+    def test_validator_created_on_first_use(self, service):
+        """Тест: валидатор создается при первой валидации и переиспользуется."""
+        assert "validator" not in vars(service)
+
+        errors = service.validate_certificate_data(
+            "example.com", "7707083893", date.today(), date.today() + timedelta(days=30), 1
+        )
+
+        assert errors == []
+        assert vars(service)["validator"] is service.validator
+
+
+class TestCertificateCache:
+    """Тесты кэша проверенных сертификатов."""
+
+    def test_invalidated_after_dates_update(self, service):
+        """Тест: после изменения дат проверка возвращает новые даты."""
+        certificate, _ = service.create_certificate(_request())
+        certificate_id = certificate.certificate_id
+
+        assert service.verify_certificate(certificate_id, 1).valid_to == certificate.valid_to
+
+        new_valid_to = certificate.valid_to + timedelta(days=30)
+        service.edit_certificate_dates(EditCertificateDatesRequest(
+            certificate_id=certificate_id,
+            new_valid_from=certificate.valid_from,
+            new_valid_to=new_valid_to,
+            edited_by=1
+        ))
+
+        assert service.verify_certificate(certificate_id, 1).valid_to == new_valid_to
+
+    def test_invalidated_after_deactivation(self, service):
+        """Тест: после деактивации проверка не отдает устаревшую запись из кэша."""
+        certificate, _ = service.create_certificate(_request())
+        certificate_id = certificate.certificate_id
+
+        assert service.verify_certificate(certificate_id, 1).is_active is True
+        assert service.deactivate_certificate(certificate_id, 1) is True
+        assert service.verify_certificate(certificate_id, 1).is_active is False
+
+    def test_read_before_invalidation_not_cached(self, service, certificate_repo, monkeypatch):
+        """Тест: запись, прочитанная до деактивации, не попадает в кэш."""
+        certificate, _ = service.create_certificate(_request())
+        certificate_id = certificate.certificate_id
+        get_certificate = certificate_repo.get_certificate_by_id
+
+        def deactivated_during_read(requested_id):
+            # Деактивация завершается, пока проверка держит прочитанную запись
+            db_certificate = get_certificate(requested_id)
+            service.deactivate_certificate(requested_id, 1)
+            return db_certificate
+
+        monkeypatch.setattr(certificate_repo, "get_certificate_by_id", deactivated_during_read)
+        assert service.verify_certificate(certificate_id, 1).is_active is True
+
+        monkeypatch.setattr(certificate_repo, "get_certificate_by_id", get_certificate)
+        assert service.verify_certificate(certificate_id, 1).is_active is False
+
+
+class TestBackgroundWork:
+    """Тесты фоновой записи файлов, истории проверок и статистики."""
+
+    def test_flush_drains_file_saves_and_audit(self, service, storage, db_manager):
+        """Тест: flush дожидается записи файлов и истории проверок."""
+        storage.save_delay = 0.2
+        certificate, _ = service.create_certificate(_request())
+        certificate_id = certificate.certificate_id
+
+        service.verify_certificate(certificate_id, 42)
+        service.verify_certificate(certificate_id, 43)
+        service.flush()
+
+        assert storage.saved == [certificate_id]
+        assert _history_actions(db_manager, certificate_id).count("verified") == 2
+
+    def test_close_writes_queued_audit_and_stops_worker(self, service, db_manager):
+        """Тест: close дописывает очередь истории проверок и останавливает поток."""
+        certificate, _ = service.create_certificate(_request())
+        certificate_id = certificate.certificate_id
+        assert service._audit_thread is None
+
+        service.verify_certificate(certificate_id, 42)
+        audit_thread = service._audit_thread
+        assert audit_thread.is_alive()
+
+        assert service.close(timeout=5) is True
+        assert not audit_thread.is_alive()
+        assert _history_actions(db_manager, certificate_id).count("verified") == 1
+
+    def test_flush_returns_after_timeout(self, service, certificate_repo, monkeypatch):
+        """Тест: flush с таймаутом не зависает, пока запись истории заблокирована."""
+        release = threading.Event()
+        write_batch = certificate_repo.add_verification_records_batch
+
+        def blocked_write(records):
+            release.wait(5)
+            write_batch(records)
+
+        monkeypatch.setattr(certificate_repo, "add_verification_records_batch", blocked_write)
+        certificate, _ = service.create_certificate(_request())
+        service.verify_certificate(certificate.certificate_id, 42)
+
+        started = time.monotonic()
+        assert service.flush(timeout=0.1) is False
+        assert time.monotonic() - started < 1
+
+        release.set()
+        assert service.flush(timeout=5) is True
+
+    def test_saves_of_one_certificate_keep_order(self, service, storage):
+        """Тест: медленная первая запись не перезаписывает более новый снимок."""
+        valid_from = date.today() + timedelta(days=1)
+        original_valid_to = valid_from + timedelta(days=365)
+        # Запись снимка при создании медленнее записи после изменения дат
+        storage.save_delay = lambda cert: 0.3 if cert.valid_to == original_valid_to else 0.0
+
+        certificate, _ = service.create_certificate(_request())
+        new_valid_to = original_valid_to + timedelta(days=30)
+        service.edit_certificate_dates(EditCertificateDatesRequest(
+            certificate_id=certificate.certificate_id,
+            new_valid_from=certificate.valid_from,
+            new_valid_to=new_valid_to,
+            edited_by=1
+        ))
+        service.flush()
+
+        assert storage.saved == [certificate.certificate_id] * 2
+        assert storage.files[certificate.certificate_id].valid_to == new_valid_to
+
+    def test_statistics_stale_snapshot_refreshed_in_background(self, service, storage):
+        """Тест: устаревший снимок статистики отдается сразу и обновляется в фоне."""
+        first = service.get_statistics()
+        assert first["file_storage"] == {"calls": 1}
+
+        # Свежий снимок отдается без обращения к хранилищу
+        assert service.get_statistics() is first
+        assert storage.stats_calls == 1
+
+        # Снимок устарел: возвращается старый, обновление идет в фоне
+        service._stats_ts -= STATS_TTL + 1
+        assert service.get_statistics() is first
+
+        deadline = time.monotonic() + 5
+        while service._stats_refreshing and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        assert service.get_statistics()["file_storage"] == {"calls": 2}
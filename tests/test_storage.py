@@ -0,0 +1,255 @@
+"""
+Тесты файлового хранилища сертификатов.
+"""
+
+import json
+import os
+from datetime import date, datetime
+
+import pytest
+
+from core.models import Certificate
+from core.exceptions import StorageError
+from core.storage import CertificateStorageManager, FileStorage
+
+
+def _certificate(index: int, domain: str = None, created_at: datetime = None) -> Certificate:
+    return Certificate(
+        certificate_id=f"AAAAA-BBBBB-CCCCC-D{index:04d}",
+        domain=domain or f"site{index}.example.com",
+        inn="7707083893",
+        valid_from=date(2025, 1, 1),
+        valid_to=date(2025, 12, 31),
+        users_count=10,
+        created_at=created_at or datetime(2025, 1, 15, 12, 0, 0),
+        created_by=123456789
+    )
+
+
+@pytest.fixture
+def storage(tmp_path):
+    return FileStorage(tmp_path / "certificates")
+
+
+class TestStorageIndex:
+    """Тесты индекса certificate_id -> путь файла."""
+
+    def test_save_lookup_delete(self, storage):
+        """Тест сохранения, поиска и удаления через индекс."""
+        certificate = _certificate(1)
+        storage.save_certificate(certificate)
+
+        assert storage._index[certificate.certificate_id] == "2025/site1.example.com_AAAAA-BBBBB-CCCCC-D0001.json"
+        assert storage.load_certificate(certificate.certificate_id)["domain"] == "site1.example.com"
+
+        assert storage.delete_certificate(certificate.certificate_id) is True
+        assert certificate.certificate_id not in storage._index
+        assert storage.load_certificate(certificate.certificate_id) is None
+        assert storage.delete_certificate(certificate.certificate_id) is False
+
+    def test_no_shared_index_file(self, storage):
+        """Тест: сохранение не пишет общий файл индекса рядом с архивом."""
+        storage.save_certificate(_certificate(1))
+
+        assert sorted(os.listdir(storage.base_path)) == ["2025"]
+
+    def test_lookup_does_not_scan_whole_archive(self, storage, monkeypatch):
+        """Тест: известный путь читается без обхода годовых директорий."""
+        certificate = _certificate(1)
+        storage.save_certificate(certificate)
+
+        def fail_scan(*args, **kwargs):
+            raise AssertionError("archive scanned")
+
+        monkeypatch.setattr(storage, "_iter_cert_files", fail_scan)
+
+        assert storage.load_certificate(certificate.certificate_id) is not None
+
+    def test_file_saved_by_other_process(self, storage):
+        """Тест: промах индекса находит файл, сохраненный другим процессом."""
+        other = FileStorage(storage.base_path)
+        certificate = _certificate(2, created_at=datetime(2024, 6, 1))
+        other.save_certificate(certificate)
+
+        assert certificate.certificate_id not in storage._index
+        assert storage.load_certificate(certificate.certificate_id)["certificate_id"] == certificate.certificate_id
+        assert storage._index[certificate.certificate_id] == "2024/site2.example.com_AAAAA-BBBBB-CCCCC-D0002.json"
+
+    def test_stale_entry_after_external_delete(self, storage):
+        """Тест: запись индекса на удаленный другим процессом файл сбрасывается."""
+        certificate = _certificate(3)
+        storage.save_certificate(certificate)
+
+        FileStorage(storage.base_path).delete_certificate(certificate.certificate_id)
+
+        assert storage.load_certificate(certificate.certificate_id) is None
+        assert certificate.certificate_id not in storage._index
+
+    def test_stale_entry_after_external_move(self, storage):
+        """Тест: запись индекса на старый путь исправляется поиском по архиву."""
+        certificate = _certificate(4, domain="old.example.com")
+        storage.save_certificate(certificate)
+
+        # Другой процесс удалил старый файл и сохранил сертификат под другим доменом
+        other = FileStorage(storage.base_path)
+        other.delete_certificate(certificate.certificate_id)
+        other.save_certificate(_certificate(4, domain="new.example.com"))
+
+        assert storage.load_certificate(certificate.certificate_id)["domain"] == "new.example.com"
+        assert storage._index[certificate.certificate_id] == "2025/new.example.com_AAAAA-BBBBB-CCCCC-D0004.json"
+
+        assert storage.delete_certificate(certificate.certificate_id) is True
+        assert not os.listdir(storage.base_path / "2025")
+
+
+def _certificate_dict(index: int, **fields) -> dict:
+    data = _certificate(index).to_dict()
+    data.update(fields)
+    return data
+
+
+def _write_backup(path, certificates, indent=None, **extra) -> None:
+    backup = {"created_at": "2025-01-20T10:00:00", "total_certificates": len(certificates)}
+    backup.update(extra)
+    backup["certificates"] = certificates
+    path.write_text(json.dumps(backup, ensure_ascii=False, indent=indent), encoding="utf-8")
+
+
+class TestBackupRestore:
+    """Тесты резервного копирования и потокового восстановления."""
+
+    @pytest.fixture
+    def target(self, tmp_path):
+        return FileStorage(tmp_path / "restored")
+
+    def test_round_trip(self, storage, target, tmp_path):
+        """Тест: бэкап восстанавливается в другое хранилище без изменений."""
+        certificates = [_certificate(i) for i in range(3)]
+        for certificate in certificates:
+            storage.save_certificate(certificate)
+
+        backup_path = storage.backup_certificates(tmp_path / "backup.json")
+
+        assert json.loads(backup_path.read_text(encoding="utf-8"))["total_certificates"] == 3
+        assert target.restore_from_backup(backup_path) == 3
+        for certificate in certificates:
+            assert target.load_certificate(certificate.certificate_id) == certificate.to_dict()
+
+    def test_special_characters_in_strings(self, target, tmp_path):
+        """Тест строк с экранированными кавычками, обратными слешами и скобками."""
+        tricky = 'он сказал "да" \\ {не} [объект] \\" }]'
+        certificates = [
+            _certificate_dict(1, note=tricky, path="C:\\certs\\"),
+            _certificate_dict(2, note="{", extra={"nested": ["]", "}"]}),
+        ]
+        backup_path = tmp_path / "backup.json"
+        _write_backup(backup_path, certificates)
+
+        assert target.restore_from_backup(backup_path) == 2
+        assert target.load_certificate(certificates[0]["certificate_id"]) == certificates[0]
+        assert target.load_certificate(certificates[1]["certificate_id"]) == certificates[1]
+
+    def test_non_ascii_domain(self, target, tmp_path):
+        """Тест кириллического домена, записанного без экранирования."""
+        certificate = _certificate_dict(1, domain="сертификат.рф")
+        backup_path = tmp_path / "backup.json"
+        _write_backup(backup_path, [certificate])
+
+        assert target.restore_from_backup(backup_path) == 1
+        assert (target.base_path / "2025" / "сертификат.рф_AAAAA-BBBBB-CCCCC-D0001.json").exists()
+        assert target.load_certificate(certificate["certificate_id"])["domain"] == "сертификат.рф"
+
+    def test_pretty_printed_legacy_backup(self, target, tmp_path):
+        """Тест старого формата: отступы и total_certificates перед массивом."""
+        certificates = [_certificate_dict(i) for i in range(2)]
+        backup_path = tmp_path / "backup.json"
+        _write_backup(backup_path, certificates, indent=2)
+
+        assert target.restore_from_backup(backup_path) == 2
+        assert target.load_certificate(certificates[1]["certificate_id"]) == certificates[1]
+
+    def test_empty_certificates(self, storage, target, tmp_path):
+        """Тест бэкапа пустого хранилища."""
+        backup_path = storage.backup_certificates(tmp_path / "backup.json")
+
+        assert json.loads(backup_path.read_text(encoding="utf-8"))["certificates"] == []
+        assert target.restore_from_backup(backup_path) == 0
+
+    @pytest.mark.parametrize("cut", [-1, -40, -200])
+    def test_truncated_backup(self, storage, target, tmp_path, cut):
+        """Тест: обрезанный бэкап отклоняется целиком, файлы не пишутся."""
+        for i in range(3):
+            storage.save_certificate(_certificate(i))
+        backup_path = storage.backup_certificates(tmp_path / "backup.json")
+        backup_path.write_bytes(backup_path.read_bytes()[:cut])
+
+        with pytest.raises(StorageError):
+            target.restore_from_backup(backup_path)
+
+        assert not target.base_path.exists() or not any(target.base_path.iterdir())
+
+    @pytest.mark.parametrize("content", [
+        b"",
+        b"[]",
+        b'{"created_at": "2025-01-20"}',
+        b'{"certificates": [{"domain": "a.com"}}]}',
+        b'{"certificates": []}]',
+        b'{"certificates": []} {"certificates": []}',
+    ])
+    def test_malformed_backup(self, target, tmp_path, content):
+        """Тест: поврежденная структура бэкапа вызывает ошибку."""
+        backup_path = tmp_path / "backup.json"
+        backup_path.write_bytes(content)
+
+        with pytest.raises(StorageError):
+            target.restore_from_backup(backup_path)
+
+
+class TestSyncFilesToDatabase:
+    """Тесты импорта файлов сертификатов в БД."""
+
+    def test_imports_missing_certificates_with_author(self, storage, certificate_repo, monkeypatch):
+        """Тест: импорт сохраняет данные автора и пропускает сертификаты, уже записанные в БД."""
+        monkeypatch.setattr("core.database.get_certificate_repo", lambda: certificate_repo)
+        certificate = _certificate(1).model_copy(update={
+            "created_by_username": "admin",
+            "created_by_full_name": "Иван Петров",
+        })
+        storage.save_certificate(certificate)
+
+        result = CertificateStorageManager(storage).sync_files_to_database()
+        assert (result["imported_count"], result["errors"]) == (1, [])
+
+        imported = certificate_repo.get_certificate_by_id(certificate.certificate_id)
+        assert (imported.created_by, imported.created_by_username, imported.created_by_full_name) == (
+            "123456789", "admin", "Иван Петров"
+        )
+        assert (imported.valid_from, imported.valid_to) == (date(2025, 1, 1), date(2025, 12, 31))
+
+        result = CertificateStorageManager(storage).sync_files_to_database()
+        assert (result["imported_count"], result["skipped_count"]) == (0, 1)
+
+    def test_failed_batch_falls_back_to_single_inserts(self, storage, certificate_repo, monkeypatch):
+        """Тест: ошибка одной строки не отменяет импорт остальных сертификатов и пакетов."""
+        monkeypatch.setattr("core.database.get_certificate_repo", lambda: certificate_repo)
+        for index in range(1, 6):
+            storage.save_certificate(_certificate(index))
+
+        bad_id = _certificate(2).certificate_id
+        bulk_insert = certificate_repo.bulk_insert
+
+        def failing_bulk_insert(rows):
+            if any(row["certificate_id"] == bad_id for row in rows):
+                raise ValueError("bad row")
+            return bulk_insert(rows)
+
+        monkeypatch.setattr(certificate_repo, "bulk_insert", failing_bulk_insert)
+
+        result = CertificateStorageManager(storage).sync_files_to_database(batch_size=2)
+
+        assert result["imported_count"] == 4
+        assert len(result["errors"]) == 2 and bad_id in result["errors"][-1]
+        assert certificate_repo.get_certificate_by_id(bad_id) is None
+        assert certificate_repo.get_existing_certificate_ids() == {
+            _certificate(index).certificate_id for index in (1, 3, 4, 5)
+        }
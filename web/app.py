@@ -21,14 +21,18 @@ from starlette.middleware.sessions import SessionMiddleware
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from config.settings import get_settings
-from core.service import get_certificate_service
+from core.service import get_certificate_service, close_certificate_service
 from core.models import CertificateRequest, SearchRequest, EditCertificateDatesRequest
 from core.email_service import get_email_service
 
 logger = logging.getLogger(__name__)
 
+# Размер страницы списка сертификатов
+CERTIFICATES_PAGE_SIZE = 100
+# Максимальное время ожидания фоновых записей при остановке, секунды
+SHUTDOWN_FLUSH_TIMEOUT = 10
+
 settings = get_settings()
-certificate_service = get_certificate_service()
 email_service = get_email_service()
 
 app = FastAPI(title="SBK Certificate Manager", docs_url=None, redoc_url=None)
@@ -42,6 +46,12 @@ app.mount("/static", StaticFiles(directory=str(web_dir / "static")), name="stati
 templates = Jinja2Templates(directory=str(web_dir / "templates"))
 
 
+@app.on_event("shutdown")
+def flush_certificate_storage():
+    """Дописывает историю проверок и файлы сертификатов при остановке."""
+    close_certificate_service(SHUTDOWN_FLUSH_TIMEOUT)
+
+
 # --- Зависимости ---
 
 def get_current_user(request: Request) -> Optional[dict]:
@@ -116,6 +126,7 @@ async def logout(request: Request):
 @app.get("/dashboard", response_class=HTMLResponse)
 async def dashboard(request: Request):
     """Панель управления."""
+    certificate_service = get_certificate_service()
     user = get_current_user(request)
     if not user:
         return RedirectResponse(url="/login", status_code=303)
@@ -135,34 +146,39 @@ async def dashboard(request: Request):
 @app.get("/certificates", response_class=HTMLResponse)
 async def certificates_list(request: Request):
     """Список сертификатов."""
+    certificate_service = get_certificate_service()
     user = get_current_user(request)
     if not user:
         return RedirectResponse(url="/login", status_code=303)
 
     search_domain = request.query_params.get("domain", "")
     search_inn = request.query_params.get("inn", "")
+    after_id = request.query_params.get("after") or None
+
+    sr = SearchRequest(
+        domain=search_domain or None,
+        inn=search_inn or None,
+        active_only=False,
+        limit=CERTIFICATES_PAGE_SIZE,
+        after_id=after_id
+    )
 
     try:
-        if search_domain or search_inn:
-            sr = SearchRequest(
-                domain=search_domain or None,
-                inn=search_inn or None,
-                active_only=False
-            )
-            certificates = certificate_service.search_certificates(sr)
-        else:
-            sr = SearchRequest(active_only=False)
-            certificates = certificate_service.search_certificates(sr)
+        certificates = certificate_service.search_certificates(sr)
     except Exception as e:
         logger.error(f"Ошибка получения сертификатов: {e}")
         certificates = []
 
+    # Если страница заполнена полностью, предлагаем следующую
+    next_after = certificates[-1].certificate_id if len(certificates) == sr.limit else None
+
     return templates.TemplateResponse("certificates.html", {
         "request": request,
         "user": user,
         "certificates": certificates,
         "search_domain": search_domain,
         "search_inn": search_inn,
+        "next_after": next_after,
     })
 
 
@@ -186,6 +202,7 @@ async def create_certificate_page(request: Request):
 @app.post("/certificates/create")
 async def create_certificate_action(request: Request):
     """Обработка создания сертификата."""
+    certificate_service = get_certificate_service()
     user = get_current_user(request)
     if not user or user.get("role") != "admin":
         return RedirectResponse(url="/login", status_code=303)
@@ -265,6 +282,7 @@ async def create_certificate_action(request: Request):
 @app.get("/certificates/verify", response_class=HTMLResponse)
 async def verify_certificate_page(request: Request):
     """Страница проверки сертификата."""
+    certificate_service = get_certificate_service()
     user = get_current_user(request)
     if not user:
         return RedirectResponse(url="/login", status_code=303)